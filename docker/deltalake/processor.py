@@ -4,34 +4,138 @@ Delta Lake Data Processor for Smart Search
 Converts JSON data to Delta Lake format and provides search API
 """
 
+import asyncio
+import heapq
 import json
 import os
+import shutil
 import sys
 import time
 import logging
+import operator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 
 import pandas as pd
+import pyarrow as pa
 import redis
+import redis.asyncio
+from cachetools import TTLCache
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.responses import JSONResponse
 import uvicorn
 from pyspark.sql import SparkSession
 from pyspark.sql.functions import col, lit, regexp_extract, when
+from pyspark.sql.types import StructType
 from delta import *
 
+try:
+    import tantivy
+    _HAS_TANTIVY = True
+except ImportError:
+    _HAS_TANTIVY = False
+
+try:
+    from deltalake import write_deltalake
+    _HAS_DELTA_RS = True
+except ImportError:
+    _HAS_DELTA_RS = False
+
+try:
+    import duckdb
+    _HAS_DUCKDB = True
+except ImportError:
+    _HAS_DUCKDB = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Columns considered searchable text across industry tables
+SEARCH_TEXT_COLUMNS = ('name', 'title', 'description', 'symbol', 'company_name', 'generic_name', 'brand_name')
+
+# Upper bound of the per-result relevance score
+MAX_SCORE = 1.0
+
+# Maximum number of text columns a table is Z-ordered by
+ZORDER_MAX_COLUMNS = 3
+
+# Engine-specific pieces of the search SQL
+SQL_DIALECTS = {
+    'spark': {'quote': '`', 'text_type': 'STRING', 'param': ':', 'escape': "'\\\\'",
+              'metadata': 'to_json(struct(*))'},
+    'duckdb': {'quote': '"', 'text_type': 'VARCHAR', 'param': '$', 'escape': "'\\'",
+               'metadata': 'CAST(to_json(t) AS VARCHAR)'},
+}
+
+# Inputs up to this many rows are written as a single file to avoid small-file overhead
+SMALL_TABLE_ROWS = 100000
+
+
+def _sql_string_literal(value: str) -> str:
+    """Render a value as a Spark SQL string literal for spark.sql(args=...)"""
+    return "'" + value.replace('\\', '\\\\').replace("'", "\\'") + "'"
+
+
+def _duckdb_string_literal(value: str) -> str:
+    """Render a value as a DuckDB string literal, which escapes quotes by doubling and not with backslashes"""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _json_text(value: Any) -> Optional[str]:
+    """Render a JSON value as text, the way Spark's JSON inference coerces mixed-type columns"""
+    return value if value is None or isinstance(value, str) else json.dumps(value)
+
+
+def _records_to_arrow(records: List[Dict[str, Any]]) -> pa.Table:
+    """Build an Arrow table from JSON records, typing columns as text where Spark's JSON inference would"""
+    try:
+        table = pa.Table.from_struct_array(pa.array(records))
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed types somewhere: keep the columns Arrow can type, JSON-encode the others as strings
+        columns = {}
+        for name in dict.fromkeys(key for record in records for key in record):
+            values = [record.get(name) for record in records]
+            try:
+                columns[name] = pa.array(values)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                columns[name] = pa.array([_json_text(value) for value in values], pa.string())
+        table = pa.table(columns)
+
+    # Keys that are null in every record have no type; the Delta writers need one
+    for index, field in enumerate(table.schema):
+        if pa.types.is_null(field.type):
+            table = table.set_column(index, field.name, table.column(index).cast(pa.string()))
+    return table
+
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input only ever matches literally"""
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
 class DeltaLakeProcessor:
     def __init__(self):
         self.spark = None
         self.redis_client = None
+        self.async_redis_client = None
+        self.duckdb = None
         self.delta_path = os.getenv('DELTA_PATH', '/data/delta')
         self.source_data_path = '/source_data'
         self.redis_url = os.getenv('REDIS_URL', 'redis://redis:6379')
+        self.schema_path = os.path.join(self.delta_path, '_schemas')
+        self._schema_cache: Dict[str, StructType] = {}
+        self.index_path = os.path.join(self.delta_path, '_indices')
+        self._projection_cache: Dict[tuple, tuple] = {}
+        self._columns_by_table: Dict[str, List[str]] = {}
+        self._text_cols_by_table: Dict[str, List[str]] = {}
+        self._indices: Dict[str, Any] = {}
+        self._tables: Set[str] = set()
+        # Shared pool for blocking Spark/Redis work issued from the API
+        self.executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv('PROCESSOR_WORKERS', str(os.cpu_count() or 8)))
+        )
         self.initialize()
 
     def initialize(self):
@@ -44,24 +148,98 @@ class DeltaLakeProcessor:
                 .config("spark.sql.catalog.spark_catalog", "org.apache.spark.sql.delta.catalog.DeltaCatalog") \
                 .config("spark.serializer", "org.apache.spark.serializer.KryoSerializer") \
                 .config("spark.sql.adaptive.enabled", "true") \
-                .config("spark.sql.adaptive.coalescePartitions.enabled", "true")
+                .config("spark.sql.adaptive.coalescePartitions.enabled", "true") \
+                .config("spark.sql.execution.arrow.pyspark.enabled", "true") \
+                .config("spark.sql.execution.arrow.maxRecordsPerBatch", "8192") \
+                .config("spark.scheduler.mode", "FAIR") \
+                .config("spark.sql.shuffle.partitions", os.getenv('SPARK_SHUFFLE_PARTITIONS', '8')) \
+                .config("spark.databricks.delta.optimizeWrite.enabled", "true") \
+                .config("spark.databricks.delta.optimizeWrite.binSize", "134217728") \
+                .config("spark.databricks.delta.autoCompact.enabled", "true") \
+                .config("spark.databricks.delta.properties.defaults.dataSkippingNumIndexedCols", "16")
             
             self.spark = configure_spark_with_delta_pip(builder).getOrCreate()
             logger.info("✅ Spark session with Delta Lake initialized")
 
             # Initialize Redis
             self.redis_client = redis.from_url(self.redis_url)
+            self._wait_for_dependencies()
             self.redis_client.ping()
+            # Endpoints share one pooled asyncio client so Redis I/O never blocks the event loop
+            self.async_redis_client = redis.asyncio.from_url(
+                self.redis_url,
+                max_connections=int(os.getenv('REDIS_MAX_CONNECTIONS', '32'))
+            )
             logger.info("✅ Redis connection established")
 
             # Create delta directories
             os.makedirs(self.delta_path, exist_ok=True)
+            os.makedirs(self.schema_path, exist_ok=True)
+            os.makedirs(self.index_path, exist_ok=True)
             logger.info(f"📁 Delta path ready: {self.delta_path}")
 
+            # DuckDB serves interactive reads straight from the Delta files when available
+            if _HAS_DUCKDB:
+                try:
+                    self.duckdb = duckdb.connect()
+                    self.duckdb.execute("INSTALL delta; LOAD delta;")
+                    logger.info("🦆 DuckDB delta_scan enabled for searches")
+                except Exception as duckdb_error:
+                    logger.warning(f"⚠️ DuckDB delta extension unavailable, using Spark for searches: {duckdb_error}")
+                    self.duckdb = None
+
+            # Table list is tracked in-process so requests don't round-trip the catalog
+            self._tables = {row['tableName'] for row in self.spark.sql("SHOW TABLES").collect()}
+            for table_name in self._tables:
+                self._register_columns(table_name, self.spark.table(table_name).columns)
+
+            # Text indexes persist next to the tables, so reopen them instead of waiting for a conversion
+            if _HAS_TANTIVY:
+                self._open_text_indices()
+
         except Exception as e:
             logger.error(f"❌ Initialization failed: {e}")
             sys.exit(1)
 
+    def _wait_for_dependencies(self, timeout: float = None, interval: float = 0.5):
+        """Poll Redis and the Delta path until both are ready or the timeout expires"""
+        if timeout is None:
+            timeout = float(os.getenv('STARTUP_TIMEOUT', '60'))
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                self.redis_client.ping()
+                os.makedirs(self.delta_path, exist_ok=True)
+                return
+            except (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError, OSError) as e:
+                if time.monotonic() >= deadline:
+                    logger.warning(f"⚠️ Dependencies not ready after {timeout:.0f}s: {e}")
+                    return
+                time.sleep(interval)
+
+    def _get_schema(self, table_name: str, column_names: List[str]) -> Optional[StructType]:
+        """Return the cached Spark schema for a table if it still matches the source columns"""
+        schema = self._schema_cache.get(table_name)
+        if schema is None:
+            schema_file = os.path.join(self.schema_path, f"{table_name}.json")
+            if not os.path.exists(schema_file):
+                return None
+            with open(schema_file, 'r') as f:
+                schema = StructType.fromJson(json.load(f))
+            self._schema_cache[table_name] = schema
+            logger.info(f"📐 Loaded cached schema for {table_name}")
+
+        if set(schema.names) != set(column_names):
+            logger.info(f"📐 Source columns changed for {table_name}, re-deriving schema")
+            return None
+        return schema
+
+    def _store_schema(self, table_name: str, schema: StructType):
+        """Persist a table schema so later conversions skip inference"""
+        self._schema_cache[table_name] = schema
+        with open(os.path.join(self.schema_path, f"{table_name}.json"), 'w') as f:
+            f.write(schema.json())
+
     def convert_json_to_delta(self, industry: str, size: str):
         """Convert JSON data files to Delta Lake tables"""
         try:
@@ -90,22 +268,42 @@ class DeltaLakeProcessor:
                     logger.warning(f"⚠️ Empty data in {filename}")
                     continue
 
-                # Convert to Spark DataFrame
-                df = self.spark.read.json(self.spark.sparkContext.parallelize([json.dumps(record) for record in data]))
-                
-                # Add metadata columns
-                df = df.withColumn("_created_at", lit(datetime.now().isoformat()))
-                df = df.withColumn("_source_file", lit(filename))
-                df = df.withColumn("_industry", lit(industry))
-                df = df.withColumn("_size", lit(size))
-
-                # Write as Delta table
-                df.write.format("delta").mode("overwrite").save(delta_table_path)
+                # Build a columnar Arrow table once for whichever writer is used
+                table = _records_to_arrow(data)
+                metadata_columns = {
+                    "_created_at": datetime.now().isoformat(),
+                    "_source_file": filename,
+                    "_industry": industry,
+                    "_size": size
+                }
+
+                if _HAS_DELTA_RS:
+                    # delta-rs writes Parquet and the _delta_log natively, no JVM hop
+                    for column_name, value in metadata_columns.items():
+                        table = table.append_column(column_name, pa.array([value] * table.num_rows, pa.string()))
+                    write_deltalake(delta_table_path, table, mode="overwrite", overwrite_schema=True)
+                    columns = table.column_names
+                else:
+                    columns = self._write_with_spark(table_name, delta_table_path, table, metadata_columns)
                 
                 # Create table in Spark catalog
                 self.spark.sql(f"CREATE TABLE IF NOT EXISTS {table_name} USING DELTA LOCATION '{delta_table_path}'")
+                self._tables.add(table_name)
+                self._register_columns(table_name, columns)
+                if table.num_rows > SMALL_TABLE_ROWS:
+                    self._zorder_text_columns(table_name)
+
+                if _HAS_TANTIVY:
+                    self._build_text_index(table_name, data)
                 
-                record_count = df.count()
+                # Row count is already known from the source file, no need to rescan the table
+                record_count = len(data)
+                if logger.isEnabledFor(logging.DEBUG):
+                    history = self.spark.sql(f"DESCRIBE HISTORY {table_name} LIMIT 1").collect()[0]
+                    # delta-rs commits don't always carry Spark's operation metrics
+                    written_rows = int((history['operationMetrics'] or {}).get('numOutputRows', record_count))
+                    if written_rows != record_count:
+                        logger.debug(f"Row count mismatch for {table_name}: wrote {written_rows}, expected {record_count}")
                 logger.info(f"✅ Created Delta table {table_name} with {record_count} records")
 
                 # Cache table statistics in Redis
@@ -123,74 +321,260 @@ class DeltaLakeProcessor:
             logger.error(f"❌ Failed to convert JSON to Delta: {e}")
             raise
 
+    def _write_with_spark(self, table_name: str, delta_table_path: str, table: pa.Table,
+                          metadata_columns: Dict[str, str]) -> List[str]:
+        """Write an Arrow table as a Delta table through Spark and return its columns"""
+        # Hand the Arrow table to Spark over Arrow IPC
+        schema = self._get_schema(table_name, table.column_names)
+        if schema is not None:
+            df = self.spark.createDataFrame(table.select(schema.names).to_pandas(), schema=schema)
+        else:
+            df = self.spark.createDataFrame(table.to_pandas())
+            self._store_schema(table_name, df.schema)
+
+        # Add metadata columns
+        for column_name, value in metadata_columns.items():
+            df = df.withColumn(column_name, lit(value))
+
+        # Keep small inputs in a single Parquet file even without Optimized Write
+        if table.num_rows <= SMALL_TABLE_ROWS:
+            df = df.coalesce(1)
+
+        # Write as Delta table
+        df.write.format("delta").mode("overwrite").save(delta_table_path)
+        return df.columns
+
+    def _zorder_text_columns(self, table_name: str):
+        """Cluster a multi-file table on its text columns so min/max stats can skip files"""
+        zorder_columns = self._text_cols_by_table[table_name][:ZORDER_MAX_COLUMNS]
+        if not zorder_columns:
+            return
+        try:
+            self.spark.sql(f"OPTIMIZE `{table_name}` ZORDER BY ({', '.join(f'`{c}`' for c in zorder_columns)})")
+            logger.info(f"🧭 Z-ordered {table_name} by {', '.join(zorder_columns)}")
+        except Exception as optimize_error:
+            logger.warning(f"⚠️ Z-order optimize failed for {table_name}: {optimize_error}")
+
+    def _build_text_index(self, table_name: str, records: List[Dict[str, Any]]):
+        """Build an inverted index over the searchable text columns of a table"""
+        if not any('id' in record for record in records):
+            return
+
+        builder = tantivy.SchemaBuilder()
+        builder.add_text_field("id", stored=True, tokenizer_name="raw")
+        builder.add_text_field("text", stored=False)
+        index_schema = builder.build()
+
+        table_index_path = os.path.join(self.index_path, table_name)
+        shutil.rmtree(table_index_path, ignore_errors=True)
+        os.makedirs(table_index_path)
+
+        index = tantivy.Index(index_schema, path=table_index_path)
+        writer = index.writer()
+        for record in records:
+            if record.get('id') is None:
+                continue
+            text = ' '.join(str(record[c]) for c in SEARCH_TEXT_COLUMNS if record.get(c))
+            writer.add_document(tantivy.Document(id=str(record['id']), text=text))
+        writer.commit()
+        index.reload()
+
+        self._indices[table_name] = index
+        logger.info(f"🗂️ Built text index for {table_name}")
+
+    def _open_text_indices(self):
+        """Reopen the persisted text index of every known table and drop those of tables that are gone"""
+        for table_name in os.listdir(self.index_path):
+            table_index_path = os.path.join(self.index_path, table_name)
+            if table_name not in self._tables:
+                shutil.rmtree(table_index_path, ignore_errors=True)
+                logger.info(f"🧹 Removed stale text index for {table_name}")
+                continue
+            try:
+                self._indices[table_name] = tantivy.Index.open(table_index_path)
+                logger.info(f"🗂️ Opened text index for {table_name}")
+            except Exception as index_error:
+                logger.warning(f"⚠️ Could not open text index for {table_name}, using LIKE scans: {index_error}")
+
+    def _indexed_ids(self, table_name: str, query: str, limit: int) -> Optional[List[str]]:
+        """Return candidate row ids from the text index, or None when it can't be used"""
+        index = self._indices.get(table_name)
+        if index is None:
+            return None
+        try:
+            searcher = index.searcher()
+            hits = searcher.search(index.parse_query(query, ["text"]), limit).hits
+            return [searcher.doc(address)["id"][0] for _, address in hits]
+        except Exception as index_error:
+            logger.warning("⚠️ Text index lookup failed for %s: %s", table_name, index_error)
+            return None
+
+    def _register_columns(self, table_name: str, columns: List[str]):
+        """Remember a table's columns so searches never have to ask Spark for them"""
+        self._columns_by_table[table_name] = list(columns)
+        self._text_cols_by_table[table_name] = [c for c in columns if c in SEARCH_TEXT_COLUMNS]
+        for engine in SQL_DIALECTS:
+            self._projection_cache.pop((table_name, engine), None)
+
+    def _table_projection(self, table_name: str, engine: str = 'spark') -> tuple:
+        """Build (and cache per table and engine) the common search projection and LIKE filter for one table"""
+        cache_key = (table_name, engine)
+        if cache_key in self._projection_cache:
+            return self._projection_cache[cache_key]
+
+        dialect = SQL_DIALECTS[engine]
+        columns = self._columns_by_table[table_name]
+        text_columns = self._text_cols_by_table[table_name]
+
+        def as_text(name: str) -> str:
+            return f"CAST({dialect['quote']}{name}{dialect['quote']} AS {dialect['text_type']})"
+
+        def column_or_null(name: str) -> str:
+            return as_text(name) if name in columns else f"CAST(NULL AS {dialect['text_type']})"
+
+        title_columns = [as_text(c) for c in ('title', 'name', 'symbol') if c in columns]
+        title_expr = f"COALESCE({', '.join(title_columns)})" if title_columns else column_or_null('title')
+        conditions = ' OR '.join(f"LOWER({as_text(c)}) LIKE {dialect['param']}pattern ESCAPE {dialect['escape']}" for c in text_columns)
+        if engine == 'duckdb':
+            source = f"delta_scan({_duckdb_string_literal(os.path.join(self.delta_path, table_name))}) AS t"
+        else:
+            source = f"`{table_name}`"
+        select_sql = f"""
+            SELECT {column_or_null('id')} AS id,
+                   {title_expr} AS title,
+                   {column_or_null('description')} AS description,
+                   {column_or_null('type')} AS type,
+                   '{table_name}' AS _table_name,
+                   {dialect['metadata']} AS _metadata
+            FROM {source}
+        """
+        projection = (select_sql, conditions)
+
+        self._projection_cache[cache_key] = projection
+        return projection
+
+    def _run_search_query(self, engine: str, query: str, limit: int) -> List[Any]:
+        """Run the UNION ALL search across every text-bearing table on one engine"""
+        dialect = SQL_DIALECTS[engine]
+        id_column = f"{dialect['quote']}id{dialect['quote']}"
+        # The query is bound as a literal substring, never spliced into the SQL text
+        pattern = f"%{_escape_like(query.lower())}%"
+        args = {"pattern": pattern if engine == 'duckdb' else _sql_string_literal(pattern)}
+        branches = []
+        for table_name in sorted(self._tables):
+            # Tables without searchable text columns are skipped without touching Spark
+            if not self._text_cols_by_table.get(table_name):
+                continue
+
+            select_sql, like_conditions = self._table_projection(table_name, engine)
+            # Indexed tables only scan the rows the inverted index matched. The index matches whole
+            # tokens, so with no hits (e.g. "micro" for "Microsoft") the substring LIKE scan still runs
+            candidate_ids = self._indexed_ids(table_name, query, limit)
+            if not candidate_ids:
+                branches.append(f"({select_sql} WHERE {like_conditions} LIMIT {limit})")
+            else:
+                param = f"ids_{len(branches)}"
+                if engine == 'duckdb':
+                    args[param] = candidate_ids
+                    id_filter = f"list_contains(${param}, CAST({id_column} AS VARCHAR))"
+                else:
+                    args[param] = _sql_string_literal(json.dumps(candidate_ids))
+                    id_filter = f"array_contains(from_json(:{param}, 'array<string>'), CAST({id_column} AS STRING))"
+                branches.append(f"({select_sql} WHERE {id_filter} LIMIT {limit})")
+
+        if not branches:
+            return []
+
+        search_sql = f"{' UNION ALL '.join(branches)} LIMIT {limit}"
+        # Results come back as Arrow and convert to dicts in C, skipping the per-row Row wrappers
+        if engine == 'duckdb':
+            cursor = self.duckdb.cursor()
+            try:
+                return cursor.execute(search_sql, args).arrow().to_pylist()
+            finally:
+                cursor.close()
+        result_df = self.spark.sql(search_sql, args=args)
+        if hasattr(result_df, 'toArrow'):
+            return result_df.toArrow().to_pylist()
+        # Spark < 4.0 has no public toArrow, but toPandas still transfers over Arrow
+        return result_df.toPandas().to_dict('records')
+
     def search_delta_tables(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
         """Search across all Delta tables"""
         try:
-            logger.info(f"🔍 Searching Delta tables for: {query}")
+            logger.info("🔍 Searching Delta tables for: %s", query)
             
-            # Get all available tables
-            tables = self.spark.sql("SHOW TABLES").collect()
-            results = []
+            # Bounded min-heap of (score, -arrival, result) holding the best `limit` results
+            top_results = []
 
-            for table_row in tables:
-                table_name = table_row['tableName']
-                
+            # One UNION ALL query so the engine plans once instead of once per table
+            limit = int(limit)
+            rows = None
+            if self.duckdb is not None:
                 try:
-                    # Generate search SQL based on table structure
-                    table_df = self.spark.table(table_name)
-                    columns = table_df.columns
-                    
-                    # Build search conditions for text columns
-                    search_conditions = []
-                    text_columns = [col for col in columns if col in ['name', 'title', 'description', 'symbol', 'company_name', 'generic_name', 'brand_name']]
-                    
-                    for col_name in text_columns:
-                        search_conditions.append(f"LOWER({col_name}) LIKE '%{query.lower()}%'")
-                    
-                    if not search_conditions:
-                        continue
-                    
-                    # Execute search query
-                    search_sql = f"""
-                        SELECT *, '{table_name}' as _table_name
-                        FROM {table_name} 
-                        WHERE {' OR '.join(search_conditions)}
-                        LIMIT {limit}
-                    """
-                    
-                    table_results = self.spark.sql(search_sql).collect()
-                    
-                    # Convert to JSON-serializable format
-                    for row in table_results:
-                        result = {
-                            "id": str(row.get('id', f"{table_name}_{len(results)}")),
-                            "title": str(row.get('title') or row.get('name') or row.get('symbol', 'Unknown')),
-                            "description": str(row.get('description', f"Data from {table_name}")),
-                            "type": row.get('type', table_name.split('_')[0]),
-                            "table": table_name,
-                            "score": 1.0,  # Could implement more sophisticated scoring
-                            "metadata": {k: str(v) for k, v in row.asDict().items() if v is not None}
-                        }
-                        results.append(result)
-                
-                except Exception as table_error:
-                    logger.warning(f"⚠️ Error searching table {table_name}: {table_error}")
-                    continue
-
-            # Sort by relevance (basic implementation)
-            results.sort(key=lambda x: x.get('score', 0), reverse=True)
+                    rows = self._run_search_query('duckdb', query, limit)
+                except Exception as duckdb_error:
+                    logger.warning("⚠️ DuckDB search failed, falling back to Spark: %s", duckdb_error)
+            if rows is None:
+                rows = self._run_search_query('spark', query, limit)
+
+            # Convert to JSON-serializable format
+            for seq, row in enumerate(rows):
+                if len(top_results) >= limit and top_results[0][0] >= MAX_SCORE:
+                    # Nothing later can displace a full heap of top-scored results
+                    break
+                table_name = row['_table_name']
+                metadata = json.loads(row['_metadata']) if row['_metadata'] else {}
+                metadata['_table_name'] = table_name
+                result = {
+                    "id": row['id'] or f"{table_name}_{seq}",
+                    "title": row['title'] or 'Unknown',
+                    "description": row['description'] or f"Data from {table_name}",
+                    "type": row['type'] or table_name.split('_')[0],
+                    "table": table_name,
+                    "score": 1.0,  # Could implement more sophisticated scoring
+                    "metadata": {k: str(v) for k, v in metadata.items() if v is not None}
+                }
+                entry = (result['score'], -seq, result)
+                if len(top_results) < limit:
+                    heapq.heappush(top_results, entry)
+                elif entry[:2] > top_results[0][:2]:
+                    heapq.heapreplace(top_results, entry)
+
+            # Highest score first, ties in arrival order
+            results = [entry[2] for entry in sorted(top_results, key=operator.itemgetter(0, 1), reverse=True)]
             
             # Cache results in Redis
             cache_key = f"search:{query.lower()}:{limit}"
-            self.redis_client.setex(cache_key, 300, json.dumps(results[:limit]))
+            self.redis_client.setex(cache_key, 300, json.dumps(results))
             
-            logger.info(f"✅ Found {len(results)} results across Delta tables")
-            return results[:limit]
+            logger.info("✅ Found %d results across Delta tables", len(results))
+            return results
 
         except Exception as e:
             logger.error(f"❌ Delta table search failed: {e}")
             raise
 
+    def _compute_table_stats(self, table_name: str) -> Dict[str, Any]:
+        """Generate table statistics when they are not cached, preferring DuckDB over Spark"""
+        record_count = None
+        if self.duckdb is not None:
+            cursor = self.duckdb.cursor()
+            try:
+                delta_table_path = os.path.join(self.delta_path, table_name)
+                record_count = cursor.execute("SELECT COUNT(*) FROM delta_scan(?)", [delta_table_path]).fetchone()[0]
+            except Exception as duckdb_error:
+                logger.warning(f"⚠️ DuckDB count failed for {table_name}, falling back to Spark: {duckdb_error}")
+            finally:
+                cursor.close()
+        if record_count is None:
+            record_count = self.spark.table(table_name).count()
+        return {
+            "table_name": table_name,
+            "record_count": record_count,
+            "created_at": datetime.now().isoformat()
+        }
+
     def get_table_stats(self, table_name: Optional[str] = None) -> Dict[str, Any]:
         """Get statistics for Delta tables"""
         try:
@@ -201,26 +585,29 @@ class DeltaLakeProcessor:
                     return json.loads(cached_stats)
                 
                 # Generate stats if not cached
-                df = self.spark.table(table_name)
-                count = df.count()
-                
-                stats = {
-                    "table_name": table_name,
-                    "record_count": count,
-                    "created_at": datetime.now().isoformat()
-                }
+                stats = self._compute_table_stats(table_name)
                 self.redis_client.setex(f"delta:stats:{table_name}", 3600, json.dumps(stats))
                 return stats
             else:
-                # Get stats for all tables
-                tables = self.spark.sql("SHOW TABLES").collect()
+                # Get stats for all tables with a single MGET round-trip
+                table_names = sorted(self._tables)
+                cached = self.redis_client.mget([f"delta:stats:{name}" for name in table_names]) if table_names else []
                 all_stats = []
+                pipe = self.redis_client.pipeline(transaction=False)
+                misses = 0
                 
-                for table_row in tables:
-                    table_name = table_row['tableName']
-                    stats = self.get_table_stats(table_name)
+                for name, cached_stats in zip(table_names, cached):
+                    if cached_stats:
+                        all_stats.append(json.loads(cached_stats))
+                        continue
+                    stats = self._compute_table_stats(name)
+                    pipe.setex(f"delta:stats:{name}", 3600, json.dumps(stats))
+                    misses += 1
                     all_stats.append(stats)
                 
+                if misses:
+                    pipe.execute()
+                
                 return {"tables": all_stats, "total_tables": len(all_stats)}
 
         except Exception as e:
@@ -230,9 +617,19 @@ class DeltaLakeProcessor:
 # Initialize processor
 processor = DeltaLakeProcessor()
 
+# Short-lived in-process cache in front of Redis for hot queries
+local_search_cache = TTLCache(
+    maxsize=int(os.getenv('LOCAL_CACHE_SIZE', '1024')),
+    ttl=float(os.getenv('LOCAL_CACHE_TTL', '30'))
+)
+
 # FastAPI app
 app = FastAPI(title="Smart Search Delta Lake Processor", version="1.0.0")
 
+async def run_blocking(func, *args):
+    """Run a synchronous processor call on the shared executor without blocking the event loop"""
+    return await asyncio.get_running_loop().run_in_executor(processor.executor, func, *args)
+
 @app.on_event("startup")
 async def startup_event():
     """Process data on startup"""
@@ -240,24 +637,34 @@ async def startup_event():
         # Convert sample data to Delta Lake
         industries = ['healthcare', 'finance', 'retail', 'education']
         sizes = ['tiny', 'small', 'medium']
-        
-        for industry in industries:
+
+        def convert_industry(industry: str):
+            # Sizes share table names, so they stay sequential within an industry
             for size in sizes:
                 try:
                     processor.convert_json_to_delta(industry, size)
                 except Exception as e:
                     logger.warning(f"⚠️ Failed to process {industry} {size}: {e}")
+
+        # Industries write independent Delta tables and run as concurrent Spark jobs
+        await asyncio.gather(*(run_blocking(convert_industry, industry) for industry in industries))
                     
         logger.info("🚀 Delta Lake processor startup completed")
     except Exception as e:
         logger.error(f"❌ Startup failed: {e}")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release the worker pool and Redis connections"""
+    processor.executor.shutdown(wait=False)
+    await processor.async_redis_client.close()
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     try:
-        processor.redis_client.ping()
-        tables = processor.spark.sql("SHOW TABLES").count()
+        await processor.async_redis_client.ping()
+        tables = len(processor._tables)
         
         return {
             "status": "healthy",
@@ -278,16 +685,24 @@ async def search(
 ):
     """Search Delta Lake tables"""
     try:
-        # Check cache first
+        # Check the in-process cache, then Redis (shared across workers)
+        local_key = (q.lower(), limit)
+        results = local_search_cache.get(local_key)
+        if results is not None:
+            return results
+
         cache_key = f"search:{q.lower()}:{limit}"
-        cached_results = processor.redis_client.get(cache_key)
+        cached_results = await processor.async_redis_client.get(cache_key)
         
         if cached_results:
-            logger.info(f"📊 Returning cached results for: {q}")
-            return json.loads(cached_results)
-        
-        # Perform search
-        results = processor.search_delta_tables(q, limit)
+            logger.info("📊 Returning cached results for: %s", q)
+            results = json.loads(cached_results)
+        else:
+            # Perform search
+            results = await run_blocking(processor.search_delta_tables, q, limit)
+
+        # Empty result lists are cached too, absorbing repeated misses
+        local_search_cache[local_key] = results
         return results
     
     except Exception as e:
@@ -298,7 +713,7 @@ async def search(
 async def get_tables():
     """Get all available Delta tables"""
     try:
-        return processor.get_table_stats()
+        return await run_blocking(processor.get_table_stats)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -306,7 +721,7 @@ async def get_tables():
 async def get_table_info(table_name: str):
     """Get information about a specific table"""
     try:
-        return processor.get_table_stats(table_name)
+        return await run_blocking(processor.get_table_stats, table_name)
     except Exception as e:
         raise HTTPException(status_code=404, detail=f"Table {table_name} not found")
 
@@ -314,15 +729,13 @@ async def get_table_info(table_name: str):
 async def convert_data(industry: str, size: str):
     """Convert JSON data to Delta Lake format"""
     try:
-        processor.convert_json_to_delta(industry, size)
+        await run_blocking(processor.convert_json_to_delta, industry, size)
         return {"message": f"Successfully converted {industry} {size} data to Delta Lake"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
-    # Wait for dependencies
-    time.sleep(30)
-    
+    # Dependencies are awaited by DeltaLakeProcessor.initialize()
     # Start the API server
     uvicorn.run(
         "processor:app",
@@ -3,59 +3,87 @@
 Convert JSON data to Parquet format for Delta Lake
 """
 
+import argparse
 import json
-import pandas as pd
+from datetime import datetime
 import pyarrow as pa
+import pyarrow.json as paj
 import pyarrow.parquet as pq
 import os
 import sys
 from pathlib import Path
 
-def convert_json_to_parquet(json_file_path, output_dir, table_name):
+# Rows per Parquet row group
+ROW_GROUP_SIZE = 65536
+
+# Values encoded per batch inside a column chunk (helps columns of large strings)
+WRITE_BATCH_SIZE = 5000
+
+def read_json_table(json_file_path):
+    """Read a JSON array or newline-delimited JSON file into an Arrow table"""
+    with open(json_file_path, 'rb') as f:
+        first_char = f.read(64).lstrip()[:1]
+
+    if first_char == b'[':
+        # JSON arrays aren't supported by the Arrow reader, convert the records in one pass
+        with open(json_file_path, 'r') as f:
+            data = json.load(f)
+        if not data:
+            return None
+        return pa.Table.from_struct_array(pa.array(data))
+
+    # Newline-delimited JSON streams straight into columnar buffers
+    return paj.read_json(json_file_path, read_options=paj.ReadOptions(block_size=8 << 20))
+
+def convert_json_to_parquet(json_file_path, output_dir, table_name,
+                            row_group_size=ROW_GROUP_SIZE, write_batch_size=WRITE_BATCH_SIZE):
     """Convert JSON file to Parquet format"""
-    
+
     print(f"Converting {json_file_path} to Parquet format...")
-    
+
     # Read JSON data
-    with open(json_file_path, 'r') as f:
-        data = json.load(f)
-    
-    if not data:
+    table = read_json_table(json_file_path)
+
+    if table is None or table.num_rows == 0:
         print(f"No data found in {json_file_path}")
         return
-    
-    # Convert to DataFrame
-    df = pd.DataFrame(data)
-    
+
     # Add metadata columns
-    df['_created_at'] = pd.Timestamp.now()
-    df['_source_file'] = os.path.basename(json_file_path)
-    
+    num_rows = table.num_rows
+    table = table.append_column('_created_at', pa.array([datetime.now()] * num_rows, pa.timestamp('us')))
+    table = table.append_column('_source_file', pa.array([os.path.basename(json_file_path)] * num_rows))
+
     # Ensure output directory exists
     os.makedirs(output_dir, exist_ok=True)
-    
+
     # Write as Parquet
     parquet_file = os.path.join(output_dir, f"{table_name}.parquet")
-    df.to_parquet(parquet_file, index=False, compression='snappy')
-    
-    print(f"Converted {len(df)} records to {parquet_file}")
+    with pq.ParquetWriter(parquet_file, table.schema, compression='snappy',
+                          write_batch_size=write_batch_size) as writer:
+        writer.write_table(table, row_group_size=row_group_size)
+
+    print(f"Converted {num_rows} records to {parquet_file}")
     return parquet_file
 
 def main():
     """Main conversion function"""
-    if len(sys.argv) < 4:
-        print("Usage: python convert_to_parquet.py <json_file> <output_dir> <table_name>")
-        sys.exit(1)
-    
-    json_file = sys.argv[1]
-    output_dir = sys.argv[2]
-    table_name = sys.argv[3]
-    
-    if not os.path.exists(json_file):
-        print(f"JSON file not found: {json_file}")
+    parser = argparse.ArgumentParser(description="Convert JSON data to Parquet format for Delta Lake")
+    parser.add_argument("json_file", help="JSON array or newline-delimited JSON file")
+    parser.add_argument("output_dir", help="Directory to write the Parquet file to")
+    parser.add_argument("table_name", help="Name of the output table / Parquet file")
+    parser.add_argument("--row-group-size", type=int, default=ROW_GROUP_SIZE,
+                        help=f"Maximum rows per Parquet row group (default: {ROW_GROUP_SIZE})")
+    parser.add_argument("--write-batch-size", type=int, default=WRITE_BATCH_SIZE,
+                        help=f"Values encoded per batch within a column chunk (default: {WRITE_BATCH_SIZE})")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.json_file):
+        print(f"JSON file not found: {args.json_file}")
         sys.exit(1)
-    
-    convert_json_to_parquet(json_file, output_dir, table_name)
+
+    convert_json_to_parquet(args.json_file, args.output_dir, args.table_name,
+                            row_group_size=args.row_group_size,
+                            write_batch_size=args.write_batch_size)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
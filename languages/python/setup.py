@@ -0,0 +1,22 @@
+"""
+Optional native build for smart-search.
+
+Project metadata lives in pyproject.toml. Setting SMART_SEARCH_MYPYC=1 at
+build time compiles the hybrid merge kernels (smart_search/core/_merge.py)
+with mypyc; otherwise the package installs as pure Python:
+
+    pip install mypy
+    SMART_SEARCH_MYPYC=1 pip install --no-build-isolation .
+"""
+
+import os
+
+from setuptools import setup
+
+ext_modules = []
+if os.environ.get("SMART_SEARCH_MYPYC") == "1":
+    from mypyc.build import mypycify
+
+    ext_modules = mypycify(["smart_search/core/_merge.py"], opt_level="3")
+
+setup(ext_modules=ext_modules)
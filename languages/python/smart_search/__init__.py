@@ -79,50 +79,22 @@ if sys.version_info < (3, 8):
     )
 
 # Optional feature detection
-_OPTIONAL_FEATURES = {
-    "redis": False,
-    "postgresql": False,
-    "mongodb": False,
-    "mysql": False,
-    "monitoring": False,
-    "web": False,
+# find_spec only consults the import finders, so heavy drivers are not executed at import time
+import importlib.util
+
+_FEATURE_MODULES = {
+    "redis": "redis",
+    "postgresql": "asyncpg",
+    "mongodb": "motor",
+    "mysql": "aiomysql",
+    "monitoring": "prometheus_client",
+    "web": "fastapi",
 }
 
-try:
-    import redis
-    _OPTIONAL_FEATURES["redis"] = True
-except ImportError:
-    pass
-
-try:
-    import asyncpg
-    _OPTIONAL_FEATURES["postgresql"] = True
-except ImportError:
-    pass
-
-try:
-    import motor
-    _OPTIONAL_FEATURES["mongodb"] = True
-except ImportError:
-    pass
-
-try:
-    import aiomysql
-    _OPTIONAL_FEATURES["mysql"] = True
-except ImportError:
-    pass
-
-try:
-    import prometheus_client
-    _OPTIONAL_FEATURES["monitoring"] = True
-except ImportError:
-    pass
-
-try:
-    import fastapi
-    _OPTIONAL_FEATURES["web"] = True
-except ImportError:
-    pass
+_OPTIONAL_FEATURES = {
+    feature: importlib.util.find_spec(module) is not None
+    for feature, module in _FEATURE_MODULES.items()
+}
 
 def get_available_features():
     """Get a dict of available optional features."""
@@ -0,0 +1,169 @@
+"""
+Pure-Python hybrid merge kernels for SmartSearch
+Fully annotated so the module can be compiled with mypyc (see setup.py)
+"""
+
+import copy
+import heapq
+import operator
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .types import SearchResult
+
+# (base result, weighted score, metadata overlays)
+WeightedEntry = Tuple[SearchResult, int, Tuple[Dict[str, Any], ...]]
+
+score_getter = operator.attrgetter("relevance_score")
+_entry_score_getter = operator.itemgetter(1)
+
+# heapq.nlargest keeps its heap in Python; below this many items C timsort plus a
+# slice is faster
+NLARGEST_MIN_ITEMS = 1024
+
+
+def clamp_score(score: int) -> int:
+    """Clamp a score to the range SearchResult enforces."""
+    return max(0, min(100, score))
+
+
+def rescored(
+    result: SearchResult, score: int, metadata: Dict[str, Any]
+) -> SearchResult:
+    """Shallow-copy a result with a new score and metadata, without re-validating it."""
+    new_result = copy.copy(result)
+    new_result.relevance_score = score
+    new_result.metadata = metadata
+    return new_result
+
+
+def top_k(results: List[SearchResult], limit: Optional[int]) -> List[SearchResult]:
+    """Highest-scored results first, keeping only `limit` of them when given."""
+    if limit is None:
+        return sorted(results, key=score_getter, reverse=True)
+    if len(results) < NLARGEST_MIN_ITEMS:
+        return sorted(results, key=score_getter, reverse=True)[:limit]
+    return heapq.nlargest(limit, results, key=score_getter)
+
+
+def union_merge(
+    cache_results: List[SearchResult],
+    db_results: List[SearchResult],
+    limit: Optional[int] = None,
+) -> List[SearchResult]:
+    """Union merge - combine all results, prioritizing cache results."""
+    seen_ids: Set[str] = set()
+    merged: List[SearchResult] = []
+
+    # Add cache results first
+    for result in cache_results:
+        if result.id not in seen_ids:
+            seen_ids.add(result.id)
+            merged.append(result)
+
+    # Add database results not already included
+    for result in db_results:
+        if result.id not in seen_ids:
+            seen_ids.add(result.id)
+            merged.append(result)
+
+    return top_k(merged, limit)
+
+
+def intersection_merge(
+    cache_results: List[SearchResult],
+    db_results: List[SearchResult],
+    limit: Optional[int] = None,
+) -> List[SearchResult]:
+    """Intersection merge - only results present in both sources."""
+    db_results_map: Dict[str, SearchResult] = {r.id: r for r in db_results}
+    intersection: List[SearchResult] = []
+
+    for cache_result in cache_results:
+        db_result = db_results_map.get(cache_result.id)
+        if db_result:
+            # Use the result with higher relevance score
+            best_result = (
+                cache_result
+                if cache_result.relevance_score >= db_result.relevance_score
+                else db_result
+            )
+            intersection.append(best_result)
+
+    return top_k(intersection, limit)
+
+
+def weighted_merge(
+    cache_results: List[SearchResult],
+    db_results: List[SearchResult],
+    cache_weight: float,
+    db_weight: float,
+    limit: Optional[int] = None,
+) -> List[SearchResult]:
+    """Weighted merge - combine results with weighted relevance scores."""
+    # Result objects are built only for the entries that survive the top-K cut
+    entries: Dict[str, WeightedEntry] = {}
+
+    # Process cache results
+    for result in cache_results:
+        weighted_score = int(result.relevance_score * cache_weight)
+        entries[result.id] = (
+            result,
+            clamp_score(weighted_score),
+            (
+                {
+                    "source": "cache",
+                    "original_score": result.relevance_score,
+                    "weighted_score": weighted_score,
+                },
+            ),
+        )
+
+    # Process database results
+    for result in db_results:
+        weighted_score = int(result.relevance_score * db_weight)
+
+        if result.id in entries:
+            # Combine scores
+            base, existing_score, overlays = entries[result.id]
+            combined_score = existing_score + weighted_score
+            entries[result.id] = (
+                base,
+                clamp_score(combined_score),
+                overlays
+                + (
+                    {
+                        "source": "hybrid",
+                        "cache_score": existing_score,
+                        "database_score": weighted_score,
+                        "combined_score": combined_score,
+                    },
+                ),
+            )
+        else:
+            entries[result.id] = (
+                result,
+                clamp_score(weighted_score),
+                (
+                    {
+                        "source": "database",
+                        "original_score": result.relevance_score,
+                        "weighted_score": weighted_score,
+                    },
+                ),
+            )
+
+    top: List[WeightedEntry]
+    if limit is None:
+        top = sorted(entries.values(), key=_entry_score_getter, reverse=True)
+    elif len(entries) < NLARGEST_MIN_ITEMS:
+        top = sorted(entries.values(), key=_entry_score_getter, reverse=True)[:limit]
+    else:
+        top = heapq.nlargest(limit, entries.values(), key=_entry_score_getter)
+
+    merged: List[SearchResult] = []
+    for base, score, overlays in top:
+        metadata: Dict[str, Any] = dict(base.metadata or {})
+        for overlay in overlays:
+            metadata.update(overlay)
+        merged.append(rescored(base, score, metadata))
+    return merged
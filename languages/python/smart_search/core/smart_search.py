@@ -4,12 +4,25 @@ Enterprise-grade search with data governance, hybrid strategies, and circuit bre
 """
 
 import asyncio
+import functools
+import hashlib
 import json
 import logging
+import os
+import re
 import time
-from typing import Dict, List, Optional, Any, Union
+from typing import Any, Awaitable, Callable, ClassVar, Dict, List, Optional, Set, Tuple, TypeVar, Union, cast
 from contextlib import asynccontextmanager
-from dataclasses import replace
+
+from cachetools import TTLCache
+
+from ._merge import (
+    intersection_merge,
+    rescored,
+    top_k,
+    union_merge,
+    weighted_merge,
+)
 
 from .types import (
     SearchResult,
@@ -23,6 +36,7 @@ from .types import (
     SecurityContext,
     SmartSearchConfig,
     DatabaseProvider,
+    BatchSearchProvider,
     CacheProvider,
     CircuitBreakerState,
     SmartSearchError,
@@ -40,6 +54,30 @@ except ImportError:
     _HAS_DATA_GOVERNANCE = False
     DataGovernanceService = None
 
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
+
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+try:
+    import hyperscan
+    _HAS_HYPERSCAN = True
+except ImportError:
+    _HAS_HYPERSCAN = False
+
+try:
+    import re2
+    _HAS_RE2 = True
+except ImportError:
+    _HAS_RE2 = False
+
 try:
     from prometheus_client import Counter, Histogram, Gauge
     _HAS_METRICS = True
@@ -59,15 +97,237 @@ try:
         'Active database connections',
         ['provider']
     )
+    l1_cache_lookups_total = Counter(
+        'smart_search_l1_hits_total',
+        'In-process L1 cache lookups',
+        ['outcome']
+    )
 except ImportError:
     _HAS_METRICS = False
 
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+# Monotonic clock for durations and timeouts; immune to wall-clock (NTP) jumps
+_now_ns = time.monotonic_ns
+
+
+def _elapsed_ms(start_ns: int) -> float:
+    """Milliseconds elapsed since a _now_ns() reading."""
+    return (_now_ns() - start_ns) / 1_000_000
+
+# Potentially sensitive values that must not be echoed back in response metadata
+_SENSITIVE_DATA_PATTERNS = (
+    r'\b\d{3}-\d{2}-\d{4}\b',  # SSN pattern
+    r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b',  # Email pattern
+    r'\b\d{3}-\d{3}-\d{4}\b',  # Phone pattern
+)
+# The same patterns fused for the fallback scan: one \b-fenced group, SSN and phone sharing a prefix.
+# RE2 runs it in linear time with no backtracking on hostile queries; re is the last resort.
+_SENSITIVE_DATA_PATTERN = (re2 if _HAS_RE2 else re).compile(
+    r'\b(?:\d{3}-\d{2,3}-\d{4}|[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,})\b'
+)
+
+
+def _sensitive_data_db_path() -> str:
+    """On-disk cache location of the compiled sensitive-data database for the current patterns."""
+    digest = hashlib.sha256("\0".join(("singlematch",) + _SENSITIVE_DATA_PATTERNS).encode()).hexdigest()[:16]
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "smart-search", f"sensitive-{digest}.hsdb")
+
+
+def _compile_sensitive_data_db() -> Any:
+    """Load or compile all sensitive-data patterns into one Hyperscan database, or None if unavailable."""
+    if not _HAS_HYPERSCAN:
+        return None
+        
+    # Deserializing is far cheaper than compiling, which matters for short-lived processes
+    path = _sensitive_data_db_path()
+    try:
+        with open(path, "rb") as f:
+            db = hyperscan.loadb(f.read(), hyperscan.HS_MODE_BLOCK)
+        db.scratch = hyperscan.Scratch(db)
+        return db
+    except Exception:
+        pass  # Missing, unreadable or built for another CPU/version; compile afresh
+        
+    try:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[p.encode() for p in _SENSITIVE_DATA_PATTERNS],
+            ids=list(range(len(_SENSITIVE_DATA_PATTERNS))),
+            elements=len(_SENSITIVE_DATA_PATTERNS),
+            flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(_SENSITIVE_DATA_PATTERNS),
+        )
+    except Exception as e:
+        logger.debug("Hyperscan unavailable for sensitive data scan, using re: %s", e)
+        return None
+        
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so concurrent imports never read a partial file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(hyperscan.dumpb(db))
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.debug("Could not cache compiled sensitive data patterns: %s", e)
+    return db
+
+
+_SENSITIVE_DATA_DB = _compile_sensitive_data_db()
+
+
+def _stop_on_first_match(*_args: Any) -> bool:
+    """Hyperscan match handler; returning True halts the scan at the first hit."""
+    return True
+
+
+@functools.lru_cache(maxsize=1024)
+def _scan_sensitive_data(query: str) -> bool:
+    """Scan a query for any sensitive-data pattern in a single pass."""
+    if _SENSITIVE_DATA_DB is not None:
+        try:
+            _SENSITIVE_DATA_DB.scan(query.encode(), match_event_handler=_stop_on_first_match)
+            return False
+        except hyperscan.ScanTerminated:
+            return True
+    return _SENSITIVE_DATA_PATTERN.search(query) is not None
+
+# Strategy outcomes whose reason never varies are shared rather than rebuilt per request;
+# like memoized strategies, callers must treat them as read-only
+_STRATEGY_NO_CACHE = SearchStrategyInfo(
+    primary=SearchStrategy.DATABASE,
+    fallback=SearchStrategy.DATABASE,
+    reason="No cache provider configured"
+)
+_STRATEGY_CACHE_BREAKER_OPEN = SearchStrategyInfo(
+    primary=SearchStrategy.DATABASE,
+    fallback=SearchStrategy.DATABASE,
+    reason="Cache circuit breaker is open"
+)
+_STRATEGY_CACHE_SEARCH_UNAVAILABLE = SearchStrategyInfo(
+    primary=SearchStrategy.DATABASE,
+    fallback=SearchStrategy.CACHE,
+    reason="Cache connected but search unavailable"
+)
+_STRATEGY_CACHE_UNAVAILABLE = SearchStrategyInfo(
+    primary=SearchStrategy.DATABASE,
+    fallback=SearchStrategy.DATABASE,
+    reason="Cache unavailable or unhealthy"
+)
+_STRATEGY_HYBRID_EARLY_CUTOFF = SearchStrategyInfo(
+    primary=SearchStrategy.CACHE,
+    fallback=SearchStrategy.DATABASE,
+    reason="Hybrid search: cache results met the early cutoff, database skipped"
+)
+_STRATEGY_HYBRID_CACHE_ONLY = SearchStrategyInfo(
+    primary=SearchStrategy.CACHE,
+    fallback=SearchStrategy.DATABASE,
+    reason="Database failed, using cache results only"
+)
+_STRATEGY_HYBRID_DATABASE_ONLY = SearchStrategyInfo(
+    primary=SearchStrategy.DATABASE,
+    fallback=SearchStrategy.CACHE,
+    reason="Cache failed, using database results only"
+)
+
+# Below this many combined results the pure-Python merges beat NumPy's setup cost
+NUMPY_MERGE_THRESHOLD = 64
+
+# A plain top-K has no id matching to vectorize, so NumPy only pays off on larger lists
+NUMPY_TOP_K_THRESHOLD = 512
+
+
+def _to_soa(results: List[SearchResult]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Split results into parallel (ids, scores) arrays for vectorized merging."""
+    ids = np.array([r.id for r in results], dtype=object)
+    scores = np.fromiter((r.relevance_score for r in results), dtype=np.int64, count=len(results))
+    return ids, scores
+
+
+def _lookup(haystack: "np.ndarray", needles: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """Return (hit mask over needles, haystack index of each hit)."""
+    if not len(haystack) or not len(needles):
+        return np.zeros(len(needles), dtype=bool), np.empty(0, dtype=np.intp)
+    sorter = np.argsort(haystack, kind="stable")
+    positions = np.searchsorted(haystack, needles, sorter=sorter)
+    positions = np.minimum(positions, len(haystack) - 1)
+    index = sorter[positions]
+    hit = haystack[index] == needles
+    return hit, index[hit]
+
+
+def _top_k_order(scores: "np.ndarray", limit: Optional[int]) -> "np.ndarray":
+    """Indices of the `limit` highest scores, ordered like a stable descending sort."""
+    if limit is None or limit >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    if limit <= 0:
+        return np.empty(0, dtype=np.intp)
+    # Keep every score tied with the k-th largest so the stable sort can break ties by position
+    kth = -np.partition(-scores, limit - 1)[limit - 1]
+    candidates = np.flatnonzero(scores >= kth)
+    return candidates[np.argsort(-scores[candidates], kind="stable")][:limit]
+
+
+def _top_k_results(results: List[SearchResult], limit: int) -> List[SearchResult]:
+    """top_k() for a single result list, partitioning a score array when only a small slice is kept."""
+    if not _HAS_NUMPY or len(results) < NUMPY_TOP_K_THRESHOLD or limit * 4 >= len(results):
+        return top_k(results, limit)
+    scores = np.fromiter((r.relevance_score for r in results), dtype=np.int64, count=len(results))
+    return [results[i] for i in _top_k_order(scores, limit).tolist()]
+
+
+def _has_unique_ids(*result_lists: List[SearchResult]) -> bool:
+    """Vectorized merges assume ids are unique within each source."""
+    return all(len({r.id for r in results}) == len(results) for results in result_lists)
+
+
+def _use_numpy_merge(cache_results: List[SearchResult], db_results: List[SearchResult]) -> bool:
+    """Decide whether the vectorized merge path applies to these inputs."""
+    return (_HAS_NUMPY and
+            len(cache_results) + len(db_results) >= NUMPY_MERGE_THRESHOLD and
+            _has_unique_ids(cache_results, db_results))
+
+
+def _canonical_json(value: Any) -> bytes:
+    """Serialize to compact, key-sorted JSON bytes (same output with or without orjson)."""
+    if _HAS_ORJSON:
+        return orjson.dumps(value, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def _hash_key(data: bytes) -> str:
+    """Hash cache-key material with stdlib blake2b, so every process sharing a cache derives the same keys."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+# Circuit breaker states, indexed into _CIRCUIT_STATE_NAMES
+_CLOSED, _OPEN, _HALF_OPEN = 0, 1, 2
+_CIRCUIT_STATE_NAMES = ("CLOSED", "OPEN", "HALF_OPEN")
+
 
 class CircuitBreaker:
-    """Simple circuit breaker implementation."""
+    """
+    Simple circuit breaker implementation.
+    
+    Not thread-safe by design: it is driven from one event loop, and no
+    method awaits while updating state, so each transition is atomic.
+    """
+    
+    __slots__ = (
+        "failure_threshold",
+        "recovery_timeout",
+        "recovery_timeout_ns",
+        "success_threshold",
+        "failure_count",
+        "success_count",
+        "last_failure_ns",
+        "_state",
+        "_open_until_ns",
+    )
     
     def __init__(
         self, 
@@ -77,27 +337,36 @@ class CircuitBreaker:
     ):
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
+        self.recovery_timeout_ns = int(recovery_timeout * 1_000_000_000)
         self.success_threshold = success_threshold
         
         self.failure_count = 0
         self.success_count = 0
-        self.last_failure_time = 0
-        self.state = "CLOSED"  # CLOSED, OPEN, HALF_OPEN
+        self.last_failure_ns = 0
+        self._state = _CLOSED
+        # Deadline after which an OPEN breaker lets a trial call through
+        self._open_until_ns = 0
+        
+    @property
+    def state(self) -> str:
+        """Current state name: CLOSED, OPEN or HALF_OPEN."""
+        return _CIRCUIT_STATE_NAMES[self._state]
         
     def is_open(self) -> bool:
         """Check if circuit breaker is open."""
-        if self.state == "OPEN":
-            # Check if recovery timeout has passed
-            if time.time() - self.last_failure_time >= self.recovery_timeout:
-                self.state = "HALF_OPEN"
-                logger.info("Circuit breaker entering HALF_OPEN state")
-                return False
+        if self._state != _OPEN:
+            return False
+        if _now_ns() < self._open_until_ns:
             return True
+        # Recovery timeout has passed
+        self._state = _HALF_OPEN
+        logger.info("Circuit breaker entering HALF_OPEN state")
         return False
         
     async def call(self, func, *args, **kwargs):
         """Execute function with circuit breaker protection."""
-        if self.is_open():
+        # Closed breakers skip the is_open() call and its clock read entirely
+        if self._state == _OPEN and self.is_open():
             raise SmartSearchError(
                 "Circuit breaker is OPEN",
                 "CIRCUIT_BREAKER_OPEN",
@@ -114,27 +383,159 @@ class CircuitBreaker:
             
     def record_success(self):
         """Record successful operation."""
-        if self.state == "HALF_OPEN":
+        state = self._state
+        if state == _CLOSED:
+            # Reset failure count on successful operation
+            if self.failure_count:
+                self.failure_count -= 1
+        elif state == _HALF_OPEN:
             self.success_count += 1
             if self.success_count >= self.success_threshold:
-                self.state = "CLOSED"
+                self._state = _CLOSED
                 self.failure_count = 0
                 self.success_count = 0
                 logger.info("Circuit breaker reset to CLOSED state")
-        elif self.state == "CLOSED":
-            # Reset failure count on successful operation
-            self.failure_count = max(0, self.failure_count - 1)
             
     def record_failure(self):
         """Record failed operation."""
+        now = _now_ns()
         self.failure_count += 1
-        self.last_failure_time = time.time()
+        self.last_failure_ns = now
         
         if self.failure_count >= self.failure_threshold:
-            self.state = "OPEN"
-            logger.warning(
-                f"Circuit breaker opened after {self.failure_count} failures"
-            )
+            self._state = _OPEN
+            self._open_until_ns = now + self.recovery_timeout_ns
+            logger.warning("Circuit breaker opened after %d failures", self.failure_count)
+
+
+# One queued search: query, options and the future its caller awaits
+_BatchItem = Tuple[str, SearchOptions, "asyncio.Future[List[SearchResult]]"]
+
+
+class BatchRunner:
+    """
+    Coalesce concurrent searches into batched provider calls.
+    
+    Callers submit (query, options) and await their own results. A background
+    worker collects submissions for up to ``linger_ms`` or ``max_batch`` items,
+    groups them by option shape and runs each group as one batch call. Single
+    searches, and every search of a batch that failed, go through
+    ``single_func`` so each caller gets its own result or error.
+    """
+    
+    def __init__(
+        self,
+        batch_func: Callable[[List[str], SearchOptions], Awaitable[List[List[SearchResult]]]],
+        single_func: Callable[[str, SearchOptions], Awaitable[List[SearchResult]]],
+        group_key: Callable[[SearchOptions], Any],
+        linger_ms: float = 2.0,
+        max_batch: int = 32
+    ) -> None:
+        self.batch_func = batch_func
+        self.single_func = single_func
+        self.group_key = group_key
+        self.linger = linger_ms / 1000
+        self.max_batch = max_batch
+        
+        self._queue: Optional["asyncio.Queue[_BatchItem]"] = None
+        self._worker: Optional["asyncio.Task[None]"] = None
+        self._dispatches: Set["asyncio.Task[None]"] = set()
+        
+    async def submit(self, query: str, options: SearchOptions) -> List[SearchResult]:
+        """Queue a search for the next batch and wait for its results."""
+        # Started lazily so the queue and worker bind to the running loop
+        queue = self._queue
+        if queue is None or self._worker is None or self._worker.done():
+            queue = self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+            
+        future: "asyncio.Future[List[SearchResult]]" = asyncio.get_running_loop().create_future()
+        await queue.put((query, options, future))
+        return await future
+    
+    async def close(self) -> None:
+        """Stop the background worker."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+    
+    async def _collect(self) -> List[_BatchItem]:
+        """Wait for one item, then gather more until the linger window or batch size is reached."""
+        queue = self._queue
+        assert queue is not None, "the worker only runs after submit() creates the queue"
+        loop = asyncio.get_running_loop()
+        items = [await queue.get()]
+        deadline = loop.time() + self.linger
+        
+        while len(items) < self.max_batch:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return items
+    
+    async def _run(self) -> None:
+        """Drain the queue forever, dispatching one batch call per option shape."""
+        while True:
+            items = await self._collect()
+            
+            groups: Dict[Any, List[_BatchItem]] = {}
+            group_key, setdefault = self.group_key, groups.setdefault
+            for item in items:
+                setdefault(group_key(item[1]), []).append(item)
+                
+            # Dispatch without awaiting so the next batch can collect meanwhile
+            for group in groups.values():
+                task = asyncio.create_task(self._dispatch(group))
+                self._dispatches.add(task)
+                task.add_done_callback(self._dispatches.discard)
+    
+    async def _dispatch(self, group: List[_BatchItem]) -> None:
+        """Run one batch call and fan its results back to the waiting callers."""
+        if len(group) == 1:
+            await self._settle(*group[0])
+            return
+            
+        queries = [query for query, _, _ in group]
+        try:
+            batch_results = await self.batch_func(queries, group[0][1])
+            if len(batch_results) != len(queries):
+                raise SmartSearchError(
+                    f"Batch search returned {len(batch_results)} result sets for {len(queries)} queries",
+                    "BATCH_SEARCH_MISMATCH"
+                )
+        except Exception as error:
+            # One bad query must not fail the rest, so retry each on its own
+            logger.warning("Batch of %d searches failed, running them separately: %s", len(group), error)
+            await asyncio.gather(*(self._settle(*item) for item in group))
+            return
+            
+        for (_, _, future), results in zip(group, batch_results):
+            if not future.done():
+                future.set_result(results)
+    
+    async def _settle(
+        self,
+        query: str,
+        options: SearchOptions,
+        future: "asyncio.Future[List[SearchResult]]"
+    ) -> None:
+        """Run one search through single_func and settle its caller's future."""
+        try:
+            results = await self.single_func(query, options)
+        except Exception as error:
+            if not future.done():
+                future.set_exception(error)
+            return
+        if not future.done():
+            future.set_result(results)
 
 
 class SmartSearch:
@@ -180,15 +581,64 @@ class SmartSearch:
                 failure_threshold=self.circuit_breaker_config.get("failure_threshold", 5),
                 recovery_timeout=self.circuit_breaker_config.get("recovery_timeout", 60.0),
             )
+        # Direct references for the hot paths; the dict above stays for reporting
+        self._cache_breaker: Optional[CircuitBreaker] = self.circuit_breakers.get("cache")
+        self._db_breaker: Optional[CircuitBreaker] = self.circuit_breakers.get("database")
             
         # Performance tracking
         self.enable_metrics = self.performance_config.get("enable_metrics", True)
         self.log_queries = self.performance_config.get("log_queries", False)
         self.slow_query_threshold = self.performance_config.get("slow_query_threshold", 1000)
+        # SearchOptions.to_dict is looked up once; metadata falls back to str() without it
+        self._options_to_dict: Optional[Callable[[SearchOptions], Any]] = getattr(SearchOptions, 'to_dict', None)
+        
+        # Pre-bound metric children so the hot path skips per-call .labels() lookups
+        self._record_metrics = self.enable_metrics and _HAS_METRICS
+        if self._record_metrics:
+            self._request_counters = {
+                (strategy, status): search_requests_total.labels(strategy=strategy, status=status)
+                for strategy in [s.value for s in SearchStrategy] + ['unknown']
+                for status in ('success', 'error')
+            }
+            self._observe_duration = search_duration_seconds.observe
+            self._l1_counters = {
+                True: l1_cache_lookups_total.labels(outcome="hit"),
+                False: l1_cache_lookups_total.labels(outcome="miss"),
+            }
         
         # Cache for health status
-        self._health_cache: Dict[str, tuple[HealthStatus, float]] = {}
         self._health_cache_ttl = self.circuit_breaker_config.get("health_cache_ttl", 30.0)
+        self._health_cache: TTLCache = TTLCache(maxsize=64, ttl=self._health_cache_ttl)
+        # Last known status per provider, served when a fresh health check fails
+        self._last_health: Dict[str, HealthStatus] = {}
+        
+        # In-process L1 in front of the remote cache provider (L2)
+        l1_size = self.cache_config.get("l1_size", 10_000)
+        self._l1: Optional[TTLCache] = None
+        if self.cache and l1_size:
+            self._l1 = TTLCache(maxsize=l1_size, ttl=self.cache_config.get("l1_ttl", 5.0))
+        
+        # Bursts of concurrent searches share one strategy decision
+        self._strategy_ttl_ns = int(self.performance_config.get("strategy_cache_ms", 100) * 1_000_000)
+        self._strategy_memo: Optional[tuple[SearchStrategyInfo, int]] = None
+        
+        # In-flight searches keyed by cache key, shared by concurrent identical callers,
+        # with the number of callers still waiting on each
+        self._inflight: Dict[Any, "asyncio.Future[Any]"] = {}
+        self._inflight_waiters: Dict["asyncio.Future[Any]", int] = {}
+        
+        # Micro-batch database searches when the provider supports batch queries. Opt-in:
+        # every search waits up to batch_linger_ms, which only pays off under heavy concurrency
+        self._batch_runner: Optional[BatchRunner] = None
+        if (self.database and isinstance(self.database, BatchSearchProvider) and
+                self.performance_config.get("batching_enabled", False)):
+            self._batch_runner = BatchRunner(
+                self._search_database_batch,
+                self._search_database_single,
+                lambda options: self._search_key("", options),
+                linger_ms=self.performance_config.get("batch_linger_ms", 2.0),
+                max_batch=self.performance_config.get("batch_max_size", 32),
+            )
         
     async def search(
         self, 
@@ -198,6 +648,9 @@ class SmartSearch:
         """
         Perform intelligent search with automatic fallback.
         
+        Concurrent calls with the same query and options share a single
+        execution and receive the same response.
+        
         Args:
             query: Search query string
             options: Search options and filters
@@ -208,78 +661,75 @@ class SmartSearch:
         if options is None:
             options = SearchOptions()
             
-        start_time = time.time()
+        return await self._singleflight(
+            self._search_key(query, options),
+            lambda: self._execute_search(query, options)
+        )
+    
+    async def _execute_search(self, query: str, options: SearchOptions) -> SearchResponse:
+        """Run the primary/fallback search strategy for a single request."""
+        start_ns = _now_ns()
         
         try:
             # Determine optimal search strategy
             strategy_info = await self._determine_search_strategy()
             
             if self.log_queries:
-                logger.info(f"Using {strategy_info.primary.value} search strategy: {strategy_info.reason}")
+                logger.info("Using %s search strategy: %s", strategy_info.primary.value, strategy_info.reason)
                 
-            results = []
-            performance = None
+            # Strategy that produced the results and any errors on the way; performance is built once below
+            strategy = strategy_info.primary
+            errors: List[str] = []
             
             # Try primary strategy
             try:
-                if strategy_info.primary == SearchStrategy.CACHE and self.cache:
+                if strategy == SearchStrategy.CACHE and self.cache:
                     results = await self._search_with_cache(query, options)
-                elif strategy_info.primary == SearchStrategy.HYBRID:
+                elif strategy == SearchStrategy.HYBRID:
                     return await self.hybrid_search(query, options)
                 else:
                     results = await self._search_with_database(query, options)
                     
                 # Cache results if using database and cache is available
-                if (strategy_info.primary == SearchStrategy.DATABASE and 
+                if (strategy == SearchStrategy.DATABASE and 
                     self.cache and 
                     options.cache_enabled and 
                     results):
                     await self._cache_results(query, options, results)
                     
-                performance = SearchPerformance(
-                    search_time=(time.time() - start_time) * 1000,  # Convert to ms
-                    result_count=len(results),
-                    strategy=strategy_info.primary,
-                    cache_hit=strategy_info.primary == SearchStrategy.CACHE,
-                )
-                
             except Exception as primary_error:
-                logger.warning(
-                    f"{strategy_info.primary.value} search failed, trying fallback: {primary_error}"
-                )
+                # Providers raise their own driver errors, so any failure triggers the fallback
+                logger.warning("%s search failed, trying fallback: %s", strategy.value, primary_error)
+                errors.append(str(primary_error))
+                strategy = strategy_info.fallback
                 
                 # Try fallback strategy
                 try:
-                    if strategy_info.fallback == SearchStrategy.CACHE and self.cache:
+                    if strategy == SearchStrategy.CACHE and self.cache:
                         results = await self._search_with_cache(query, options)
                     else:
                         results = await self._search_with_database(query, options)
                         
-                    performance = SearchPerformance(
-                        search_time=(time.time() - start_time) * 1000,
-                        result_count=len(results),
-                        strategy=strategy_info.fallback,
-                        cache_hit=strategy_info.fallback == SearchStrategy.CACHE,
-                        errors=[str(primary_error)]
-                    )
-                    
                 except Exception as fallback_error:
                     # Both strategies failed
-                    performance = SearchPerformance(
-                        search_time=(time.time() - start_time) * 1000,
-                        result_count=0,
-                        strategy=SearchStrategy.DATABASE,
-                        cache_hit=False,
-                        errors=[str(primary_error), str(fallback_error)]
-                    )
+                    errors.append(str(fallback_error))
+                    strategy = SearchStrategy.DATABASE
+                    results = []
+                    
+            performance = SearchPerformance(
+                search_time=_elapsed_ms(start_ns),
+                result_count=len(results),
+                strategy=strategy,
+                cache_hit=strategy == SearchStrategy.CACHE,
+                errors=errors
+            )
                     
             # Record metrics
-            if self.enable_metrics and _HAS_METRICS:
-                search_requests_total.labels(
-                    strategy=performance.strategy.value,
-                    status='success' if results else 'error'
-                ).inc()
-                search_duration_seconds.observe(performance.search_time / 1000)
+            if self._record_metrics:
+                self._request_counters[
+                    (performance.strategy.value, 'success' if results else 'error')
+                ].inc()
+                self._observe_duration(performance.search_time / 1000)
                 
             # Log performance
             if self.enable_metrics:
@@ -289,21 +739,14 @@ class SmartSearch:
                 results=results,
                 performance=performance,
                 strategy=strategy_info,
-                metadata={
-                    "query": query if not self._contains_sensitive_data(query) else "[REDACTED]",
-                    "options": options.to_dict() if hasattr(options, 'to_dict') else str(options),
-                    "timestamp": time.time()
-                }
+                metadata=self._build_metadata(query, options)
             )
             
         except Exception as error:
-            logger.error(f"Complete search failure: {error}")
+            logger.error("Complete search failure: %s", error)
             
-            if self.enable_metrics and _HAS_METRICS:
-                search_requests_total.labels(
-                    strategy='unknown',
-                    status='error'
-                ).inc()
+            if self._record_metrics:
+                self._request_counters[('unknown', 'error')].inc()
                 
             raise SmartSearchError(
                 f"Search failed: {str(error)}",
@@ -337,7 +780,7 @@ class SmartSearch:
         if options is None:
             options = SearchOptions()
             
-        start_time = time.time()
+        start_ns = _now_ns()
         audit_id = ""
         
         try:
@@ -372,7 +815,7 @@ class SmartSearch:
                 audit_id=audit_id,
                 compliance_status="COMPLIANT",
                 metadata={
-                    **search_response.metadata,
+                    **(search_response.metadata or {}),
                     "user_id": user_context.user_id,
                     "user_role": user_context.user_role,
                     "security_applied": True
@@ -386,7 +829,7 @@ class SmartSearch:
                     query,
                     user_context,
                     [],
-                    (time.time() - start_time) * 1000,
+                    _elapsed_ms(start_ns),
                     success=False,
                     error_message=str(error)
                 )
@@ -420,25 +863,56 @@ class SmartSearch:
         if options is None:
             options = SearchOptions()
             
-        start_time = time.time()
+        return await self._singleflight(
+            ("hybrid",) + self._search_key(query, options),
+            lambda: self._execute_hybrid_search(query, options)
+        )
+    
+    async def _execute_hybrid_search(self, query: str, options: SearchOptions) -> SearchResponse:
+        """Run cache and database searches in parallel and merge their results."""
+        start_ns = _now_ns()
+        
+        # Execute both searches in parallel
+        cache_task = asyncio.ensure_future(self._search_with_cache(query, options))
+        db_task = asyncio.ensure_future(self._search_with_database(query, options))
         
         try:
-            # Execute both searches in parallel
-            cache_task = self._search_with_cache(query, options)
-            db_task = self._search_with_database(query, options)
-            
-            cache_results, db_results = await asyncio.gather(
-                cache_task, db_task, return_exceptions=True
-            )
+            # Give the cache a short head start; a full page of confident hits makes the database redundant
+            hedge_seconds = self.hybrid_search_config.get("hedge_ms", 5) / 1000
+            done, _ = await asyncio.wait({cache_task}, timeout=hedge_seconds)
+            early_results = self._early_cutoff_results(cache_task, options) if cache_task in done else None
+            if early_results is not None:
+                db_task.cancel()
+                return SearchResponse(
+                    results=early_results,
+                    performance=SearchPerformance(
+                        search_time=_elapsed_ms(start_ns),
+                        result_count=len(early_results),
+                        strategy=SearchStrategy.CACHE,
+                        cache_hit=True,
+                    ),
+                    strategy=_STRATEGY_HYBRID_EARLY_CUTOFF,
+                    metadata={
+                        "hybrid_search": True,
+                        "early_cutoff": True,
+                        "cache_results": len(cache_task.result()),
+                        "db_results": 0
+                    }
+                )
             
-            # Process results
-            cache_success = not isinstance(cache_results, Exception)
-            db_success = not isinstance(db_results, Exception)
+            # Both tasks already exist, so wait on them directly instead of wrapping them in a gather
+            await asyncio.wait((cache_task, db_task))
+            cache_error = cache_task.exception()
+            db_error = db_task.exception()
+            cache_success = cache_error is None
+            db_success = db_error is None
+            cache_results = cache_task.result() if cache_success else cache_error
+            db_results = db_task.result() if db_success else db_error
             
             if cache_success and db_success:
                 # Both succeeded - merge results
                 merged_results = self._merge_search_results(
-                    cache_results, db_results
+                    cache_results, db_results, options.limit
                 )
                 strategy_info = SearchStrategyInfo(
                     primary=SearchStrategy.HYBRID,
@@ -447,18 +921,10 @@ class SmartSearch:
                 )
             elif cache_success:
                 merged_results = cache_results
-                strategy_info = SearchStrategyInfo(
-                    primary=SearchStrategy.CACHE,
-                    fallback=SearchStrategy.DATABASE,
-                    reason="Database failed, using cache results only"
-                )
+                strategy_info = _STRATEGY_HYBRID_CACHE_ONLY
             elif db_success:
                 merged_results = db_results
-                strategy_info = SearchStrategyInfo(
-                    primary=SearchStrategy.DATABASE,
-                    fallback=SearchStrategy.CACHE,
-                    reason="Cache failed, using database results only"
-                )
+                strategy_info = _STRATEGY_HYBRID_DATABASE_ONLY
             else:
                 raise SmartSearchError(
                     "Both cache and database searches failed",
@@ -466,7 +932,7 @@ class SmartSearch:
                 )
                 
             performance = SearchPerformance(
-                search_time=(time.time() - start_time) * 1000,
+                search_time=_elapsed_ms(start_ns),
                 result_count=len(merged_results),
                 strategy=SearchStrategy.HYBRID,
                 cache_hit=cache_success,
@@ -492,6 +958,26 @@ class SmartSearch:
                 f"Hybrid search failed: {str(error)}",
                 "HYBRID_SEARCH_ERROR"
             )
+        finally:
+            # Don't leave a search running if this call was cancelled mid-flight
+            for task in (cache_task, db_task):
+                if not task.done():
+                    task.cancel()
+    
+    def _early_cutoff_results(
+        self, cache_task: "asyncio.Future[List[SearchResult]]", options: SearchOptions
+    ) -> Optional[List[SearchResult]]:
+        """Top cache results if they alone are good enough to answer a hybrid search, else None."""
+        if cache_task.cancelled() or cache_task.exception() is not None:
+            return None
+        results = cache_task.result()
+        if not results or len(results) < options.limit:
+            return None
+        top = _top_k_results(results, options.limit)
+        # Every returned result must clear the confidence cutoff
+        if top[-1].relevance_score < self.hybrid_search_config.get("early_cutoff_score", 80):
+            return None
+        return top
     
     async def get_cache_health(self) -> Optional[HealthStatus]:
         """Get cached health status for cache provider."""
@@ -499,37 +985,62 @@ class SmartSearch:
             return None
             
         cache_key = "cache"
-        now = time.time()
         
         # Return cached health if recent
-        if cache_key in self._health_cache:
-            health_status, timestamp = self._health_cache[cache_key]
-            if now - timestamp < self._health_cache_ttl:
-                return health_status
-                
+        health_status: Optional[HealthStatus] = self._health_cache.get(cache_key)
+        if health_status is not None:
+            return health_status
+            
+        # Concurrent callers share one in-flight health check
+        return await self._singleflight(("health", cache_key), lambda: self._check_cache_health(cache_key))
+    
+    async def _check_cache_health(self, cache_key: str) -> HealthStatus:
+        """Run a fresh cache health check and remember its result."""
+        assert self.cache is not None, "only called by get_cache_health() with a cache configured"
         try:
             health_status = await self.cache.check_health()
-            self._health_cache[cache_key] = (health_status, now)
+            self._health_cache[cache_key] = health_status
+            self._last_health[cache_key] = health_status
             return health_status
         except Exception as error:
-            logger.error(f"Cache health check failed: {error}")
+            logger.error("Cache health check failed: %s", error)
             # Return cached status or default unhealthy status
-            if cache_key in self._health_cache:
-                return self._health_cache[cache_key][0]
-            return HealthStatus(
-                is_connected=False,
-                is_search_available=False,
-                latency=-1,
-                memory_usage="0",
-                key_count=0,
-                last_sync=None,
-                errors=[str(error)]
-            )
+            if cache_key in self._last_health:
+                return self._last_health[cache_key]
+            return self._unhealthy_status(error)
+    
+    @staticmethod
+    def _unhealthy_status(error: BaseException) -> HealthStatus:
+        """Default status for a provider whose health check failed."""
+        return HealthStatus(
+            is_connected=False,
+            is_search_available=False,
+            latency=-1,
+            memory_usage="0",
+            key_count=0,
+            last_sync=None,
+            errors=[str(error)]
+        )
     
     async def get_search_stats(self) -> Dict[str, Any]:
         """Get comprehensive search service statistics."""
-        cache_health = await self.get_cache_health()
-        database_health = await self.database.check_health()
+        # Independent round trips; the strategy check shares the in-flight cache health check
+        cache_health, database_health, strategy_result = await asyncio.gather(
+            self.get_cache_health(),
+            self.database.check_health(),
+            self._determine_search_strategy(),
+            return_exceptions=True
+        )
+        if isinstance(cache_health, Exception):
+            cache_health = self._unhealthy_status(cache_health)
+        if isinstance(database_health, Exception):
+            logger.error("Database health check failed: %s", database_health)
+            database_health = self._unhealthy_status(database_health)
+        recommended_strategy: Optional[SearchStrategyInfo] = None
+        if isinstance(strategy_result, BaseException):
+            logger.error("Search strategy check failed: %s", strategy_result)
+        else:
+            recommended_strategy = strategy_result
         
         return {
             "cache_health": cache_health,
@@ -542,11 +1053,11 @@ class SmartSearch:
                 }
                 for name, cb in self.circuit_breakers.items()
             },
-            "recommended_strategy": await self._determine_search_strategy(),
+            "recommended_strategy": recommended_strategy,
             "configuration": {
                 "hybrid_search_enabled": self.hybrid_search_enabled,
                 "data_governance_enabled": self.data_governance is not None,
-                "metrics_enabled": self.enable_metrics and _HAS_METRICS,
+                "metrics_enabled": self._record_metrics,
                 "cache_enabled": self.cache is not None
             }
         }
@@ -555,31 +1066,38 @@ class SmartSearch:
         """Clear cache data with optional pattern matching."""
         if not self.cache:
             return
-            
+
+        # L1 keys are hashed, so a pattern can't select entries; drop all of them
+        if self._l1 is not None:
+            self._l1.clear()
+
         try:
             await self.cache.clear(pattern)
             if self.log_queries:
                 logger.info("Cache cleared successfully")
         except Exception as error:
-            logger.error(f"Failed to clear cache: {error}")
+            logger.error("Failed to clear cache: %s", error)
     
     # Private helper methods
     async def _determine_search_strategy(self) -> SearchStrategyInfo:
+        """Determine the optimal search strategy, reusing a decision made in the last few ms."""
+        memo = self._strategy_memo
+        now = _now_ns()
+        if memo is not None and now - memo[1] < self._strategy_ttl_ns:
+            return memo[0]
+            
+        strategy_info = await self._compute_search_strategy()
+        self._strategy_memo = (strategy_info, now)
+        return strategy_info
+    
+    async def _compute_search_strategy(self) -> SearchStrategyInfo:
         """Determine the optimal search strategy based on health and circuit breaker states."""
         if not self.cache:
-            return SearchStrategyInfo(
-                primary=SearchStrategy.DATABASE,
-                fallback=SearchStrategy.DATABASE,
-                reason="No cache provider configured"
-            )
+            return _STRATEGY_NO_CACHE
             
         # Check circuit breakers
-        if "cache" in self.circuit_breakers and self.circuit_breakers["cache"].is_open():
-            return SearchStrategyInfo(
-                primary=SearchStrategy.DATABASE,
-                fallback=SearchStrategy.DATABASE,
-                reason="Cache circuit breaker is open"
-            )
+        if self._cache_breaker is not None and self._cache_breaker.is_open():
+            return _STRATEGY_CACHE_BREAKER_OPEN
             
         # Check cache health
         cache_health = await self.get_cache_health()
@@ -596,38 +1114,110 @@ class SmartSearch:
             )
             
         if cache_health and cache_health.is_connected and not cache_health.is_search_available:
-            return SearchStrategyInfo(
-                primary=SearchStrategy.DATABASE,
-                fallback=SearchStrategy.CACHE,
-                reason="Cache connected but search unavailable"
-            )
+            return _STRATEGY_CACHE_SEARCH_UNAVAILABLE
             
         # Cache unavailable
-        return SearchStrategyInfo(
-            primary=SearchStrategy.DATABASE,
-            fallback=SearchStrategy.DATABASE,
-            reason="Cache unavailable or unhealthy"
-        )
+        return _STRATEGY_CACHE_UNAVAILABLE
+    
+    async def _singleflight(self, key: Any, func: Callable[[], Awaitable[_T]]) -> _T:
+        """Run func once per key, letting concurrent callers await the same result."""
+        # Lookup and insert happen with no await in between, so this is race-free on the event loop
+        task: Optional["asyncio.Future[_T]"] = self._inflight.get(key)
+        if task is None:
+            # The work runs as its own task so no single caller's cancellation aborts it
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            self._inflight_waiters[task] = 0
+            task.add_done_callback(functools.partial(self._singleflight_done, key))
+        self._inflight_waiters[task] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if not task.done():
+                # This caller was cancelled; stop the work once nobody is left waiting for it
+                self._inflight_waiters[task] -= 1
+                if self._inflight_waiters[task] == 0:
+                    self._forget_inflight(key, task)
+                    task.cancel()
+    
+    def _forget_inflight(self, key: Any, task: "asyncio.Future[Any]") -> None:
+        # A later call may already have started a new task under the same key
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+    
+    def _singleflight_done(self, key: Any, task: "asyncio.Future[Any]") -> None:
+        self._forget_inflight(key, task)
+        self._inflight_waiters.pop(task, None)
+        if not task.cancelled():
+            # Mark the exception retrieved in case every caller had already gone
+            task.exception()
     
     async def _search_with_cache(self, query: str, options: SearchOptions) -> List[SearchResult]:
-        """Search using cache provider with circuit breaker protection."""
+        """Search using the L1 cache, then the cache provider with circuit breaker protection."""
         if not self.cache:
             raise CacheConnectionError("Cache provider not configured")
             
-        circuit_breaker = self.circuit_breakers.get("cache")
-        if circuit_breaker:
-            return await circuit_breaker.call(self.cache.search, query, options)
+        l1 = self._l1
+        key = None
+        if l1 is not None:
+            key = self._search_key(query, options)
+            cached: Optional[List[SearchResult]] = l1.get(key)
+            if self._record_metrics:
+                self._l1_counters[cached is not None].inc()
+            if cached is not None:
+                return list(cached)
+            
+        results: List[SearchResult]
+        circuit_breaker = self._cache_breaker
+        if circuit_breaker is not None:
+            results = await circuit_breaker.call(self.cache.search, query, options)
         else:
-            return await self.cache.search(query, options)
+            results = await self.cache.search(query, options)
+            
+        # Promote L2 hits into L1
+        if l1 is not None and results:
+            l1[key] = list(results)
+        return results
     
     async def _search_with_database(self, query: str, options: SearchOptions) -> List[SearchResult]:
         """Search using database provider with circuit breaker protection."""
-        circuit_breaker = self.circuit_breakers.get("database")
-        if circuit_breaker:
+        if self._batch_runner:
+            return await self._batch_runner.submit(query, options)
+        return await self._search_database_single(query, options)
+    
+    async def _search_database_single(self, query: str, options: SearchOptions) -> List[SearchResult]:
+        """Run one database search under the circuit breaker."""
+        circuit_breaker = self._db_breaker
+        if circuit_breaker is not None:
             return await circuit_breaker.call(self.database.search, query, options)
         else:
             return await self.database.search(query, options)
     
+    async def _search_database_batch(
+        self, 
+        queries: List[str], 
+        options: SearchOptions
+    ) -> List[List[SearchResult]]:
+        """Run a batch of database searches sharing the same options."""
+        # Only set up as the batch function when the provider is a BatchSearchProvider
+        database = cast(BatchSearchProvider, self.database)
+        circuit_breaker = self._db_breaker
+        if circuit_breaker is None:
+            return await database.search_batch(queries, options)
+        
+        # A failed batch is retried query by query through the breaker, which records
+        # those failures; only the successes are recorded here, once per query
+        if circuit_breaker.is_open():
+            raise SmartSearchError(
+                "Circuit breaker is OPEN",
+                "CIRCUIT_BREAKER_OPEN",
+                {"failure_count": circuit_breaker.failure_count, "state": circuit_breaker.state}
+            )
+        batch_results = await database.search_batch(queries, options)
+        for _ in queries:
+            circuit_breaker.record_success()
+        return batch_results
+    
     async def _cache_results(self, query: str, options: SearchOptions, results: List[SearchResult]) -> None:
         """Cache search results for future use."""
         if not self.cache or not results:
@@ -637,137 +1227,166 @@ class SmartSearch:
             cache_key = self._generate_cache_key(query, options)
             ttl = options.cache_ttl or self.cache_config.get("default_ttl", 300)
             
+            # Write through to L1 so the next identical search skips the network
+            if self._l1 is not None:
+                self._l1[self._search_key(query, options)] = list(results)
+            
             # Convert results to dict for JSON serialization
             cached_data = [result.to_dict() for result in results]
             await self.cache.set(cache_key, cached_data, ttl)
             
         except Exception as error:
-            logger.warning(f"Failed to cache search results: {error}")
+            logger.warning("Failed to cache search results: %s", error)
+    
+    def _search_key(self, query: str, options: SearchOptions) -> Tuple[Any, ...]:
+        """Hashable in-process key for a query and options (L1, in-flight and batch grouping)."""
+        # Only filters need canonical JSON, the rest is a plain tuple
+        filters = options.filters.to_dict() if options.filters else None
+        return (
+            query,
+            options.limit,
+            options.offset,
+            options.sort_by.value,
+            options.sort_order.value,
+            _canonical_json(filters) if filters else b"",
+        )
     
     def _generate_cache_key(self, query: str, options: SearchOptions) -> str:
-        """Generate cache key from query and options."""
-        import hashlib
-        
-        # Create a deterministic key from query and options
-        key_data = {
-            "query": query,
-            "limit": options.limit,
-            "offset": options.offset,
-            "sort_by": options.sort_by.value,
-            "sort_order": options.sort_order.value,
-            "filters": options.filters.to_dict() if options.filters else {}
-        }
-        
-        key_string = json.dumps(key_data, sort_keys=True)
-        key_hash = hashlib.md5(key_string.encode()).hexdigest()
-        
-        return f"search:{key_hash}"
+        """Generate the remote cache key from query and options."""
+        return f"search:{_hash_key(repr(self._search_key(query, options)).encode())}"
     
     def _merge_search_results(
         self, 
         cache_results: List[SearchResult], 
-        db_results: List[SearchResult]
+        db_results: List[SearchResult],
+        limit: Optional[int] = None
     ) -> List[SearchResult]:
-        """Merge results from cache and database sources."""
+        """Merge results from cache and database sources, keeping the top `limit`."""
         algorithm = self.hybrid_search_config.get("merging_algorithm", "weighted")
         cache_weight = self.hybrid_search_config.get("cache_weight", 0.7)
         db_weight = self.hybrid_search_config.get("database_weight", 0.3)
         
         if algorithm == "union":
-            return self._union_merge(cache_results, db_results)
+            return self._union_merge(cache_results, db_results, limit)
         elif algorithm == "intersection":
-            return self._intersection_merge(cache_results, db_results)
+            return self._intersection_merge(cache_results, db_results, limit)
         elif algorithm == "weighted":
-            return self._weighted_merge(cache_results, db_results, cache_weight, db_weight)
+            return self._weighted_merge(cache_results, db_results, cache_weight, db_weight, limit)
         else:
-            return self._union_merge(cache_results, db_results)
+            return self._union_merge(cache_results, db_results, limit)
     
-    def _union_merge(self, cache_results: List[SearchResult], db_results: List[SearchResult]) -> List[SearchResult]:
+    def _union_merge(
+        self, 
+        cache_results: List[SearchResult], 
+        db_results: List[SearchResult],
+        limit: Optional[int] = None
+    ) -> List[SearchResult]:
         """Union merge - combine all results, prioritizing cache results."""
-        seen_ids = set()
-        merged = []
-        
-        # Add cache results first
-        for result in cache_results:
-            if result.id not in seen_ids:
-                seen_ids.add(result.id)
-                merged.append(result)
-                
-        # Add database results not already included
-        for result in db_results:
-            if result.id not in seen_ids:
-                seen_ids.add(result.id)
-                merged.append(result)
-                
-        return sorted(merged, key=lambda x: x.relevance_score, reverse=True)
+        if _use_numpy_merge(cache_results, db_results):
+            sources = cache_results + db_results
+            ids, scores = _to_soa(sources)
+            _, first = np.unique(ids, return_index=True)
+            first.sort()
+            order = first[_top_k_order(scores[first], limit)]
+            return [sources[i] for i in order]
+            
+        return union_merge(cache_results, db_results, limit)
     
-    def _intersection_merge(self, cache_results: List[SearchResult], db_results: List[SearchResult]) -> List[SearchResult]:
+    def _intersection_merge(
+        self, 
+        cache_results: List[SearchResult], 
+        db_results: List[SearchResult],
+        limit: Optional[int] = None
+    ) -> List[SearchResult]:
         """Intersection merge - only results present in both sources."""
-        db_results_map = {r.id: r for r in db_results}
-        intersection = []
-        
-        for cache_result in cache_results:
-            db_result = db_results_map.get(cache_result.id)
-            if db_result:
-                # Use the result with higher relevance score
-                best_result = cache_result if cache_result.relevance_score >= db_result.relevance_score else db_result
-                intersection.append(best_result)
-                
-        return sorted(intersection, key=lambda x: x.relevance_score, reverse=True)
+        if _use_numpy_merge(cache_results, db_results):
+            c_ids, c_scores = _to_soa(cache_results)
+            d_ids, d_scores = _to_soa(db_results)
+            hit, db_index = _lookup(d_ids, c_ids)
+            cache_index = np.flatnonzero(hit)
+            cache_wins = c_scores[cache_index] >= d_scores[db_index]
+            best_scores = np.where(cache_wins, c_scores[cache_index], d_scores[db_index])
+            order = _top_k_order(best_scores, limit)
+            return [
+                cache_results[cache_index[i]] if cache_wins[i] else db_results[db_index[i]]
+                for i in order
+            ]
+            
+        return intersection_merge(cache_results, db_results, limit)
     
     def _weighted_merge(
         self, 
         cache_results: List[SearchResult], 
         db_results: List[SearchResult],
         cache_weight: float,
-        db_weight: float
+        db_weight: float,
+        limit: Optional[int] = None
     ) -> List[SearchResult]:
         """Weighted merge - combine results with weighted relevance scores."""
-        result_map = {}
-        
-        # Process cache results
-        for result in cache_results:
-            weighted_score = int(result.relevance_score * cache_weight)
-            new_result = replace(result, relevance_score=weighted_score)
-            if hasattr(new_result, 'metadata'):
-                new_result.metadata = {
-                    **(new_result.metadata or {}),
+        if _use_numpy_merge(cache_results, db_results):
+            return self._weighted_merge_numpy(cache_results, db_results, cache_weight, db_weight, limit)
+            
+        return weighted_merge(cache_results, db_results, cache_weight, db_weight, limit)
+    
+    def _weighted_merge_numpy(
+        self, 
+        cache_results: List[SearchResult], 
+        db_results: List[SearchResult],
+        cache_weight: float,
+        db_weight: float,
+        limit: Optional[int] = None
+    ) -> List[SearchResult]:
+        """Vectorized weighted merge, scoring on arrays and building only the top `limit` results."""
+        c_ids, c_scores = _to_soa(cache_results)
+        d_ids, d_scores = _to_soa(db_results)
+        # Truncate like int() and clamp like SearchResult.__post_init__
+        c_weighted = np.clip((c_scores * cache_weight).astype(np.int64), 0, 100)
+        d_weighted = np.clip((d_scores * db_weight).astype(np.int64), 0, 100)
+        
+        hit, cache_index = _lookup(c_ids, d_ids)
+        combined = np.zeros(len(cache_results), dtype=np.int64)
+        combined[cache_index] = c_weighted[cache_index] + d_weighted[hit]
+        in_both = np.zeros(len(cache_results), dtype=bool)
+        in_both[cache_index] = True
+        db_score_for_cache = np.zeros(len(cache_results), dtype=np.int64)
+        db_score_for_cache[cache_index] = d_weighted[hit]
+        
+        cache_final = np.where(in_both, np.clip(combined, 0, 100), c_weighted)
+        db_only = np.flatnonzero(~hit)
+        scores = np.concatenate([cache_final, d_weighted[db_only]])
+        order = _top_k_order(scores, limit)
+        
+        merged = []
+        n_cache = len(cache_results)
+        for i in order:
+            if i < n_cache:
+                result = cache_results[i]
+                cache_score = int(c_weighted[i])
+                metadata = {
+                    **(result.metadata or {}),
                     "source": "cache",
                     "original_score": result.relevance_score,
-                    "weighted_score": weighted_score
+                    "weighted_score": cache_score
                 }
-            result_map[result.id] = new_result
-            
-        # Process database results
-        for result in db_results:
-            weighted_score = int(result.relevance_score * db_weight)
-            
-            if result.id in result_map:
-                # Combine scores
-                existing = result_map[result.id]
-                combined_score = existing.relevance_score + weighted_score
-                combined_result = replace(existing, relevance_score=combined_score)
-                if hasattr(combined_result, 'metadata'):
-                    combined_result.metadata = {
-                        **(combined_result.metadata or {}),
+                if in_both[i]:
+                    database_score = int(db_score_for_cache[i])
+                    metadata.update({
                         "source": "hybrid",
-                        "cache_score": existing.relevance_score,
-                        "database_score": weighted_score,
-                        "combined_score": combined_score
-                    }
-                result_map[result.id] = combined_result
+                        "cache_score": cache_score,
+                        "database_score": database_score,
+                        "combined_score": cache_score + database_score
+                    })
             else:
-                new_result = replace(result, relevance_score=weighted_score)
-                if hasattr(new_result, 'metadata'):
-                    new_result.metadata = {
-                        **(new_result.metadata or {}),
-                        "source": "database",
-                        "original_score": result.relevance_score,
-                        "weighted_score": weighted_score
-                    }
-                result_map[result.id] = new_result
-                
-        return sorted(result_map.values(), key=lambda x: x.relevance_score, reverse=True)
+                result = db_results[db_only[i - n_cache]]
+                metadata = {
+                    **(result.metadata or {}),
+                    "source": "database",
+                    "original_score": result.relevance_score,
+                    "weighted_score": int(scores[i])
+                }
+            merged.append(rescored(result, int(scores[i]), metadata))
+            
+        return merged
     
     def _log_search_performance(
         self, 
@@ -777,45 +1396,104 @@ class SmartSearch:
     ) -> None:
         """Log search performance metrics."""
         log_level = logging.WARNING if performance.errors else logging.INFO
+        slow = performance.search_time > self.slow_query_threshold
         
-        if self.log_queries or performance.search_time > self.slow_query_threshold:
+        if (self.log_queries or slow) and logger.isEnabledFor(log_level):
             logger.log(
                 log_level,
-                f"Search '{query[:50]}...': {performance.result_count} results in {performance.search_time:.1f}ms "
-                f"via {performance.strategy.value} ({strategy.reason})"
+                "Search '%s...': %d results in %.1fms via %s (%s)",
+                query[:50], performance.result_count, performance.search_time,
+                performance.strategy.value, strategy.reason
             )
             
-        if performance.search_time > self.slow_query_threshold:
-            logger.warning(f"Slow query detected: {performance.search_time:.1f}ms for '{query[:50]}...'")
+        if slow and logger.isEnabledFor(logging.WARNING):
+            logger.warning("Slow query detected: %.1fms for '%s...'", performance.search_time, query[:50])
+    
+    def _build_metadata(self, query: str, options: SearchOptions) -> Dict[str, Any]:
+        """Build response metadata, skipping the query scan and options dump when nothing consumes them."""
+        if not (self.log_queries or self.enable_metrics):
+            return {"timestamp": time.time()}
+            
+        return {
+            "query": query if not self._contains_sensitive_data(query) else "[REDACTED]",
+            "options": self._options_to_dict(options) if self._options_to_dict is not None else str(options),
+            "timestamp": time.time()
+        }
     
     def _contains_sensitive_data(self, query: str) -> bool:
         """Check if query contains potentially sensitive information."""
-        sensitive_patterns = [
-            r'\b\d{3}-\d{2}-\d{4}\b',  # SSN pattern
-            r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',  # Email pattern
-            r'\b\d{3}-\d{3}-\d{4}\b',  # Phone pattern
-        ]
-        
-        import re
-        for pattern in sensitive_patterns:
-            if re.search(pattern, query):
-                return True
-        return False
+        # Every pattern needs a '-' (SSN, phone) or an '@' (email); most queries have neither
+        if '-' not in query and '@' not in query:
+            return False
+        return _scan_sensitive_data(query)
+    
+    # Providers connected through any SmartSearch context, keyed by identity so per-request
+    # instances sharing a provider reuse its warm pool: id -> [provider, users, connect task]
+    _connections: ClassVar[Dict[int, List[Any]]] = {}
+    
+    async def _acquire_provider(self, provider: Any) -> None:
+        """Connect a provider on first use, or join the connection another context opened."""
+        key = id(provider)
+        entry = self._connections.get(key)
+        if entry is None:
+            connect = asyncio.ensure_future(provider.connect()) if hasattr(provider, 'connect') else None
+            entry = self._connections[key] = [provider, 0, connect]
+        entry[1] += 1
+        if entry[2] is None:
+            return
+        connect = entry[2]
+        try:
+            # Shield so one cancelled caller doesn't abort a connect others are waiting on
+            await asyncio.shield(connect)
+        except BaseException:
+            entry[1] -= 1
+            failed = connect.done() and (connect.cancelled() or connect.exception() is not None)
+            # A failed connect is retried by the next caller; otherwise the last waiter cleans up
+            if (failed or entry[1] == 0) and self._connections.get(key) is entry:
+                del self._connections[key]
+                if not connect.done():
+                    connect.cancel()
+                elif not failed and hasattr(provider, 'disconnect'):
+                    await provider.disconnect()
+            raise
+    
+    async def _release_provider(self, provider: Any) -> None:
+        """Drop this context's use of a provider, disconnecting it after the last user."""
+        key = id(provider)
+        entry = self._connections.get(key)
+        if entry is not None:
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+            del self._connections[key]
+        if hasattr(provider, 'disconnect'):
+            await provider.disconnect()
     
     async def __aenter__(self):
         """Async context manager entry."""
-        if hasattr(self.database, 'connect'):
-            await self.database.connect()
-        if self.cache and hasattr(self.cache, 'connect'):
-            await self.cache.connect()
+        providers = [self.database, self.cache] if self.cache else [self.database]
+        # Open providers in parallel rather than one after another
+        acquires = [asyncio.ensure_future(self._acquire_provider(provider)) for provider in providers]
+        try:
+            await asyncio.gather(*acquires)
+        except BaseException:
+            # Settle every acquire, then give back the ones that succeeded
+            for task in acquires:
+                task.cancel()
+            await asyncio.wait(acquires)
+            for provider, task in zip(providers, acquires):
+                if not task.cancelled() and task.exception() is None:
+                    await self._release_provider(provider)
+            raise
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        if hasattr(self.database, 'disconnect'):
-            await self.database.disconnect()
-        if self.cache and hasattr(self.cache, 'disconnect'):
-            await self.cache.disconnect()
+        if self._batch_runner:
+            await self._batch_runner.close()
+        await self._release_provider(self.database)
+        if self.cache:
+            await self._release_provider(self.cache)
 
 
 # Convenience function for quick setup
@@ -8,17 +8,27 @@ from typing import (
     Dict,
     List,
     Optional,
+    Tuple,
+    Type,
+    TypeVar,
     Union,
     Literal,
     Protocol,
+    cast,
     runtime_checkable,
 )
-from dataclasses import dataclass, field
+from dataclasses import MISSING, InitVar, dataclass, field, fields
 from datetime import datetime
 from enum import Enum
+import secrets
+import sys
 import uuid
 
 
+# Slotted dataclasses (Python 3.10+) drop the per-instance __dict__; older versions keep it
+_DATACLASS_OPTIONS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
 # Enums for better type safety
 class SearchResultType(str, Enum):
     """Types of search results."""
@@ -74,8 +84,89 @@ class SortOrder(str, Enum):
     DESC = "desc"
 
 
+_E = TypeVar("_E", bound=Enum)
+_D = TypeVar("_D")
+
+
+def _to_enum(enum_cls: Type[_E], value: Any) -> _E:
+    """
+    Coerce a raw value to a member of enum_cls.
+
+    Plain strings are resolved with one lookup in the enum's value map, skipping
+    EnumMeta.__call__; anything else, including unknown values, goes through the
+    Enum call so it still raises ValueError.
+    """
+    if value.__class__ is str:
+        member = enum_cls._value2member_map_.get(value)
+        if member is not None:
+            return member  # type: ignore[return-value]
+    return enum_cls(value)
+
+
 # Data classes for structured data
-@dataclass
+def _specialize_codecs(cls: Type[_D]) -> Type[_D]:
+    """
+    Replace a dataclass's to_dict() and from_dict_trusted() with straight-line code
+    generated for its fields.
+
+    The generated functions read and assign each field directly, converting those
+    named in _ENUM_FIELDS and _DATETIME_FIELDS and interning those in _INTERNED_FIELDS,
+    and behave exactly like the generic methods they replace without the per-call
+    field loops.
+    """
+    enum_fields: Tuple[str, ...] = getattr(cls, "_ENUM_FIELDS", ())
+    datetime_fields: Tuple[str, ...] = getattr(cls, "_DATETIME_FIELDS", ())
+    interned_fields: Tuple[str, ...] = getattr(cls, "_INTERNED_FIELDS", ())
+    namespace: Dict[str, Any] = {"datetime": datetime, "_missing": MISSING, "_intern": sys.intern}
+    dump = ["def to_dict(self):", "    result = {}"]
+    load = ["def from_dict_trusted(cls, data):", "    get = data.get", "    result = object.__new__(cls)"]
+    for f in fields(cast(Any, cls)):
+        name = f.name
+        if name in enum_fields:
+            encode = "value.value"
+            namespace[f"_enum_{name}"] = {member.value: member for member in cast(Type[Enum], f.type)}
+            decode = f"_enum_{name}[value]"
+        elif name in datetime_fields:
+            encode = "value.isoformat() if isinstance(value, datetime) else value"
+            decode = "datetime.fromisoformat(value) if isinstance(value, str) else value"
+        elif name in interned_fields:
+            encode = "value"
+            decode = "_intern(value) if value.__class__ is str else value"
+        else:
+            encode = decode = "value"
+        dump += [
+            f"    value = self.{name}",
+            "    if value is not None:",
+            f"        result[{name!r}] = {encode}",
+        ]
+        if f.default_factory is not MISSING:
+            namespace[f"_factory_{name}"] = f.default_factory
+            load += [
+                f"    value = get({name!r}, _missing)",
+                f"    result.{name} = _factory_{name}() if value is _missing else {decode}",
+            ]
+        else:
+            namespace[f"_default_{name}"] = None if f.default is MISSING else f.default
+            load += [
+                f"    value = get({name!r}, _default_{name})",
+                f"    result.{name} = {decode}",
+            ]
+    dump.append("    return result")
+    load.append("    return result")
+
+    exec("\n".join(dump + load), namespace)
+    for method in ("to_dict", "from_dict_trusted"):
+        generated = namespace[method]
+        original = cls.__dict__[method]
+        generated.__doc__ = getattr(original, "__func__", original).__doc__
+        generated.__qualname__ = f"{cls.__qualname__}.{method}"
+        generated.__module__ = cls.__module__
+        setattr(cls, method, classmethod(generated) if isinstance(original, classmethod) else generated)
+    return cls
+
+
+@_specialize_codecs
+@dataclass(**_DATACLASS_OPTIONS)
 class SearchResult:
     """Represents a single search result."""
     id: str
@@ -105,29 +196,45 @@ class SearchResult:
     url: Optional[str] = None
     score: Optional[float] = None
     book_title: Optional[str] = None
-    metadata: Optional[Dict[str, Any]] = field(default_factory=dict)
+    metadata: Optional[Dict[str, Any]] = None
+    # Constructor-only flag for callers that already pass enum members and a 0-100 score
+    _trusted: InitVar[bool] = False
 
-    def __post_init__(self):
+    # Fields needing conversion in to_dict(); the enums are always set by __post_init__
+    _ENUM_FIELDS = ("type", "match_type")
+    _DATETIME_FIELDS = ("created_at",)
+    # Low-cardinality strings repeated across results; interned so duplicates share one object
+    _INTERNED_FIELDS = ("category", "language", "visibility")
+
+    def __post_init__(self, _trusted: bool = False) -> None:
         """Validate and normalize data after initialization."""
+        if _trusted:
+            return
         if not isinstance(self.type, SearchResultType):
-            self.type = SearchResultType(self.type)
+            self.type = _to_enum(SearchResultType, self.type)
         if not isinstance(self.match_type, MatchType):
-            self.match_type = MatchType(self.match_type)
+            self.match_type = _to_enum(MatchType, self.match_type)
+        for name in self._INTERNED_FIELDS:
+            value = getattr(self, name)
+            if type(value) is str:
+                setattr(self, name, sys.intern(value))
         
-        # Ensure relevance_score is within valid range
-        self.relevance_score = max(0, min(100, self.relevance_score))
+        # Ensure relevance_score is within valid range; in-range scores are left untouched
+        score = self.relevance_score
+        if not 0 <= score <= 100:
+            self.relevance_score = 0 if score < 0 else 100
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
-        result = {}
-        for key, value in self.__dict__.items():
-            if value is not None:
-                if isinstance(value, datetime):
-                    result[key] = value.isoformat()
-                elif isinstance(value, Enum):
-                    result[key] = value.value
-                else:
-                    result[key] = value
+        # Reference implementation; _specialize_codecs installs an equivalent generated version
+        values = ((f.name, getattr(self, f.name)) for f in fields(self))
+        result = {key: value for key, value in values if value is not None}
+        for key in self._ENUM_FIELDS:
+            result[key] = result[key].value
+        for key in self._DATETIME_FIELDS:
+            value = result.get(key)
+            if isinstance(value, datetime):
+                result[key] = value.isoformat()
         return result
 
     @classmethod
@@ -141,15 +248,47 @@ class SearchResult:
                 data["created_at"] = None
         
         # Handle enum fields
-        if "type" in data and isinstance(data["type"], str):
-            data["type"] = SearchResultType(data["type"])
-        if "match_type" in data and isinstance(data["match_type"], str):
-            data["match_type"] = MatchType(data["match_type"])
+        value = data.get("type")
+        if isinstance(value, str):
+            data["type"] = _to_enum(SearchResultType, value)
+        value = data.get("match_type")
+        if isinstance(value, str):
+            data["match_type"] = _to_enum(MatchType, value)
             
         return cls(**data)
 
+    @classmethod
+    def from_dict_trusted(cls, data: Dict[str, Any]) -> "SearchResult":
+        """
+        Rebuild a result from a to_dict() payload this SDK wrote itself, such as a cached entry.
+
+        Skips __init__ and its validation, which the payload already passed when it was
+        written; only the enum and datetime values are restored and the low-cardinality
+        strings interned. Does not modify data.
+        """
+        # Reference implementation; _specialize_codecs installs an equivalent generated version
+        state: Dict[str, Any] = {}
+        for f in fields(cls):
+            if f.default_factory is not MISSING:
+                state[f.name] = f.default_factory()
+            else:
+                state[f.name] = None if f.default is MISSING else f.default
+        state.update(data)
+        state["type"] = SearchResultType(state["type"])
+        state["match_type"] = MatchType(state["match_type"])
+        if isinstance(state["created_at"], str):
+            state["created_at"] = datetime.fromisoformat(state["created_at"])
+        for name in cls._INTERNED_FIELDS:
+            if type(state[name]) is str:
+                state[name] = sys.intern(state[name])
+            
+        result = object.__new__(cls)
+        for name, value in state.items():
+            setattr(result, name, value)
+        return result
 
-@dataclass
+
+@dataclass(**_DATACLASS_OPTIONS)
 class DateRange:
     """Date range filter."""
     start: Optional[datetime] = None
@@ -162,7 +301,7 @@ class DateRange:
         }
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class SearchFilters:
     """Search filtering options."""
     type: Optional[List[SearchResultType]] = None
@@ -170,11 +309,11 @@ class SearchFilters:
     language: Optional[List[str]] = None
     visibility: Optional[List[str]] = None
     date_range: Optional[DateRange] = None
-    custom: Optional[Dict[str, Any]] = field(default_factory=dict)
+    custom: Optional[Dict[str, Any]] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        result = {}
+        result: Dict[str, Any] = {}
         if self.type:
             result["type"] = [t.value if isinstance(t, SearchResultType) else t for t in self.type]
         if self.category:
@@ -190,7 +329,7 @@ class SearchFilters:
         return result
 
 
-@dataclass 
+@dataclass(**_DATACLASS_OPTIONS)
 class SearchOptions:
     """Search configuration options."""
     limit: int = 20
@@ -206,14 +345,14 @@ class SearchOptions:
     def __post_init__(self):
         """Validate options after initialization."""
         if not isinstance(self.sort_by, SortBy):
-            self.sort_by = SortBy(self.sort_by)
+            self.sort_by = _to_enum(SortBy, self.sort_by)
         if not isinstance(self.sort_order, SortOrder):
-            self.sort_order = SortOrder(self.sort_order)
+            self.sort_order = _to_enum(SortOrder, self.sort_order)
         if self.filters is None:
             self.filters = SearchFilters()
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class SearchStrategyInfo:
     """Information about search strategy used."""
     primary: SearchStrategy
@@ -222,12 +361,12 @@ class SearchStrategyInfo:
 
     def __post_init__(self):
         if not isinstance(self.primary, SearchStrategy):
-            self.primary = SearchStrategy(self.primary)
+            self.primary = _to_enum(SearchStrategy, self.primary)
         if not isinstance(self.fallback, SearchStrategy):
-            self.fallback = SearchStrategy(self.fallback)
+            self.fallback = _to_enum(SearchStrategy, self.fallback)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class SearchPerformance:
     """Search performance metrics."""
     search_time: float  # Time in milliseconds
@@ -238,10 +377,10 @@ class SearchPerformance:
 
     def __post_init__(self):
         if not isinstance(self.strategy, SearchStrategy):
-            self.strategy = SearchStrategy(self.strategy)
+            self.strategy = _to_enum(SearchStrategy, self.strategy)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class HealthStatus:
     """Health status information."""
     is_connected: bool
@@ -255,10 +394,10 @@ class HealthStatus:
     response_time: Optional[float] = None
     message: Optional[str] = None
     timestamp: Optional[datetime] = None
-    details: Optional[Dict[str, Any]] = field(default_factory=dict)
+    details: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class SecurityContext:
     """Security context for data governance."""
     user_id: str
@@ -276,7 +415,7 @@ class SecurityContext:
             self.session_id = str(uuid.uuid4())
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class CircuitBreakerState:
     """Circuit breaker state information."""
     is_open: bool
@@ -285,7 +424,7 @@ class CircuitBreakerState:
     next_retry_time: float  # Timestamp
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class AuditLogEntry:
     """Audit log entry for compliance."""
     id: str
@@ -308,7 +447,8 @@ class AuditLogEntry:
 
     def __post_init__(self):
         if not self.id:
-            self.id = f"audit_{int(self.timestamp.timestamp())}_{str(uuid.uuid4())[:8]}"
+            # Same 8 random hex digits as a uuid4 prefix, without building the UUID
+            self.id = f"audit_{int(self.timestamp.timestamp())}_{secrets.token_hex(4)}"
 
 
 # Protocol definitions for providers
@@ -338,6 +478,15 @@ class DatabaseProvider(Protocol):
         ...
 
 
+@runtime_checkable
+class BatchSearchProvider(Protocol):
+    """Protocol for database providers that can run several searches in one call."""
+
+    async def search_batch(self, queries: List[str], options: SearchOptions) -> List[List[SearchResult]]:
+        """Perform one search per query with shared options, results in query order."""
+        ...
+
+
 @runtime_checkable
 class CacheProvider(Protocol):
     """Protocol for cache providers."""
@@ -364,7 +513,7 @@ class CacheProvider(Protocol):
         ...
 
     async def get(self, key: str) -> Optional[Any]:
-        """Get cache value."""
+        """Get cache value. Results cached by SmartSearch can be restored with SearchResult.from_dict_trusted."""
         ...
 
     async def delete(self, key: str) -> None:
@@ -424,7 +573,7 @@ class SearchResponse:
     results: List[SearchResult]
     performance: SearchPerformance
     strategy: SearchStrategyInfo
-    metadata: Optional[Dict[str, Any]] = field(default_factory=dict)
+    metadata: Optional[Dict[str, Any]] = None
 
 
 @dataclass
@@ -524,6 +673,7 @@ __all__ = [
     
     # Protocols
     "DatabaseProvider",
+    "BatchSearchProvider",
     "CacheProvider",
     
     # Exceptions
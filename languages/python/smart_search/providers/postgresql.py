@@ -6,9 +6,13 @@ Enterprise-grade PostgreSQL search with advanced indexing and performance analys
 import asyncio
 import json
 import logging
+import os
+import re
 import time
-from typing import Dict, List, Optional, Any, Union
+from collections import deque
+from typing import Deque, Dict, List, Optional, Any, Tuple, Union
 from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
 
 try:
     import asyncpg
@@ -17,6 +21,18 @@ except ImportError:
     _HAS_ASYNCPG = False
     asyncpg = None
 
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+try:
+    import uvloop
+    _HAS_UVLOOP = True
+except ImportError:
+    _HAS_UVLOOP = False
+
 from ..core.types import (
     SearchResult,
     SearchOptions, 
@@ -31,6 +47,27 @@ from ..core.types import (
 
 logger = logging.getLogger(__name__)
 
+# Hosts a Unix-domain socket can stand in for
+_LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+# Searches with a larger limit stream rows through a server-side cursor in batches of this size;
+# below it the cursor's extra BEGIN/COMMIT round trips cost more than buffering the rows
+STREAM_MIN_LIMIT = 100
+STREAM_BATCH_SIZE = 256
+
+# Table the search queries read
+SEARCH_TABLE = "search_data"
+
+# Document text indexed for full-text search, stored as search_data.search_tsv by create_optimized_indexes
+FTS_DOCUMENT = "to_tsvector('english', title || ' ' || COALESCE(description, ''))"
+
+# Queries slower than this (in nanoseconds) count as slow and are kept in the slow-query log
+SLOW_QUERY_NS = 1_000_000_000
+SLOW_LOG_SIZE = 128
+
+# $N placeholders in a search template, renumbered when it is wrapped into a batch statement
+_PLACEHOLDER = re.compile(r"\$(\d+)")
+
 
 class PostgreSQLProvider:
     """
@@ -50,9 +87,11 @@ class PostgreSQLProvider:
     def __init__(
         self,
         connection_string: str,
-        pool_size: int = 20,
-        max_pool_size: int = 30,
-        search_config: Optional[Dict[str, Any]] = None
+        pool_size: int = 25,
+        max_pool_size: int = 50,
+        search_config: Optional[Dict[str, Any]] = None,
+        statement_cache_size: int = 1024,
+        unix_socket_dir: Optional[str] = None
     ):
         if not _HAS_ASYNCPG:
             raise DatabaseConnectionError(
@@ -63,17 +102,28 @@ class PostgreSQLProvider:
         self.pool_size = pool_size
         self.max_pool_size = max_pool_size
         self.search_config = search_config or {}
+        # Prepared statements kept per connection by asyncpg, LRU-evicted by SQL text
+        self.statement_cache_size = statement_cache_size
+        # Socket directory (e.g. /var/run/postgresql) used instead of TCP for a local server.
+        # Opt-in: pg_hba.conf applies its 'local' rules, which can differ from 'host' ones
+        self.unix_socket_dir = unix_socket_dir
+        # SQL text per (sort_by, sort_order, type filter, category filter, start date, end date) presence
+        self._query_templates: Dict[Tuple[Any, ...], str] = {}
+        # Batch statement per single-search SQL text, see _build_batch_query()
+        self._batch_templates: Dict[str, str] = {}
+        # Whether search_data has the stored search_tsv column with a GIN index on it, detected on connect
+        self._has_search_tsv = False
         
         self.pool: Optional[asyncpg.Pool] = None
         self.connected = False
         
         # Performance tracking
-        self.query_stats = {
-            "total_queries": 0,
-            "total_time": 0,
-            "slow_queries": 0,
-            "error_count": 0
-        }
+        self._total_queries = 0
+        self._total_time_ns = 0
+        self._slow_queries = 0
+        self._error_count = 0
+        # (query, time in ms, result count) of the most recent slow queries
+        self.slow_log: Deque[Tuple[str, float, int]] = deque(maxlen=SLOW_LOG_SIZE)
         
         # Default search configuration
         self.default_search_config = {
@@ -83,20 +133,47 @@ class PostgreSQLProvider:
             "max_results": 1000,
             "highlight_results": True,
             "enable_fuzzy_search": True,
-            "search_rank_normalization": True
+            "search_rank_normalization": True,
+            # Per-session memory for sorts and bitmap heap scans, so large trigram matches stay in memory
+            "work_mem": "64MB",
+            # Indexes loaded into shared buffers on connect (requires pg_prewarm)
+            "prewarm_indexes": ["idx_search_data_search_tsv", "idx_search_data_fts"]
         }
         self.search_config = {**self.default_search_config, **self.search_config}
         
+    @staticmethod
+    def install_fast_loop() -> bool:
+        """
+        Run asyncio on uvloop's event loop when uvloop is installed.
+        
+        asyncpg awaits several times per query, so loop overhead shows up on fast
+        queries. Call once at process start, before asyncio.run() creates the loop;
+        loops that already exist are not affected. Returns True if uvloop is in use.
+        """
+        if not _HAS_UVLOOP:
+            return False
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        return True
+    
     async def connect(self) -> None:
         """Establish connection pool to PostgreSQL."""
         try:
             self.pool = await asyncpg.create_pool(
                 self.connection_string,
+                **self._unix_socket_kwargs(),
                 min_size=self.pool_size,
                 max_size=self.max_pool_size,
                 command_timeout=60,
+                statement_cache_size=self.statement_cache_size,
+                # Search statements run a few KB; asyncpg's 15 KB default leaves little headroom
+                max_cacheable_statement_size=32 * 1024,
+                # Recycle connections periodically and close ones idle for 10 minutes
+                max_queries=50000,
+                max_inactive_connection_lifetime=600,
+                init=self._init_connection,
                 server_settings={
                     'jit': 'off',  # Disable JIT for consistent performance
+                    'work_mem': self.search_config["work_mem"],
                     'application_name': 'smart_search_python'
                 }
             )
@@ -136,41 +213,82 @@ class PostgreSQLProvider:
         Combines:
         - Full-text search with ts_vector
         - Trigram similarity for fuzzy matching
-        - ILIKE pattern matching for exact matches
+        - ILIKE pattern matching when trigram search is disabled
         - Semantic ranking and highlighting
         """
         if not self.pool:
             raise DatabaseConnectionError("Not connected to PostgreSQL")
         
-        start_time = time.time()
+        start_ns = time.monotonic_ns()
         
         try:
             async with self.pool.acquire() as conn:
                 # Build dynamic query based on search configuration
                 search_query, params = self._build_search_query(query, options)
                 
-                # Execute search with performance tracking
-                logger.debug(f"Executing PostgreSQL search: {search_query}")
-                rows = await conn.fetch(search_query, *params)
-                
-                # Convert to SearchResult objects
-                results = self._convert_rows_to_results(rows, query)
+                # Execute search with performance tracking; the SQL text depends only on the
+                # query shape, so asyncpg reuses the connection's prepared statement for it
+                logger.debug("Executing PostgreSQL search: %s", search_query)
                 
-                # Apply result filtering and sorting
-                filtered_results = self._apply_post_processing(results, options)
+                # Convert to SearchResult objects; filtering and sorting already happened in SQL
+                if options.limit > STREAM_MIN_LIMIT:
+                    results = await self._fetch_streamed(conn, search_query, params, query)
+                else:
+                    rows = await conn.fetch(search_query, *params)
+                    results = self._convert_rows_to_results(rows, query)
                 
                 # Update performance statistics
-                query_time = (time.time() - start_time) * 1000
-                self._update_query_stats(query_time, len(filtered_results))
+                query_ns = time.monotonic_ns() - start_ns
+                self._update_query_stats(query_ns, len(results), query)
                 
-                logger.info(f"PostgreSQL search returned {len(filtered_results)} results in {query_time:.1f}ms")
-                return filtered_results
+                logger.info("PostgreSQL search returned %d results in %.1fms", len(results), query_ns / 1e6)
+                return results
                 
         except Exception as e:
-            self.query_stats["error_count"] += 1
+            self._error_count += 1
             logger.error(f"PostgreSQL search failed: {e}")
             raise SmartSearchError(f"PostgreSQL search error: {str(e)}", "POSTGRESQL_SEARCH_ERROR")
     
+    async def search_batch(self, queries: List[str], options: SearchOptions) -> List[List[SearchResult]]:
+        """
+        Run several searches that share the same options as one statement.
+        
+        The terms are bound as one text[] parameter and each is searched in a
+        LATERAL subquery, so the batch costs one round trip and one pooled
+        connection. Result lists come back in query order.
+        """
+        if not self.pool:
+            raise DatabaseConnectionError("Not connected to PostgreSQL")
+        
+        start_ns = time.monotonic_ns()
+        
+        try:
+            async with self.pool.acquire() as conn:
+                batch_query, params = self._build_batch_query(queries, options)
+                logger.debug("Executing PostgreSQL batch search: %s", batch_query)
+                rows = await conn.fetch(batch_query, *params)
+                
+                # Rows arrive grouped by the 1-based ordinal of the term they matched
+                grouped: List[List[asyncpg.Record]] = [[] for _ in queries]
+                for row in rows:
+                    grouped[row["batch_ord"] - 1].append(row)
+                batch_results = [
+                    self._convert_rows_to_results(query_rows, query)
+                    for query, query_rows in zip(queries, grouped)
+                ]
+                
+                # One statement ran, so it is recorded once with its real latency
+                batch_ns = time.monotonic_ns() - start_ns
+                self._update_query_stats(batch_ns, len(rows), " | ".join(queries))
+                
+                logger.info("PostgreSQL batch of %d searches completed in %.1fms", len(queries), batch_ns / 1e6)
+                return batch_results
+                
+        except Exception as e:
+            self._error_count += 1
+            logger.error(f"PostgreSQL batch search failed: {e}")
+            raise SmartSearchError(f"PostgreSQL search error: {str(e)}", "POSTGRESQL_SEARCH_ERROR")
+    
     async def check_health(self) -> HealthStatus:
         """Check PostgreSQL health and performance metrics."""
         if not self.pool:
@@ -224,7 +342,7 @@ class PostgreSQLProvider:
                         "active_connections": stats['active_connections'],
                         "database_size_bytes": stats['db_size'],
                         "available_extensions": extension_names,
-                        "query_stats": self.query_stats.copy()
+                        "query_stats": self.query_stats
                     }
                 )
         
@@ -242,16 +360,27 @@ class PostgreSQLProvider:
             )
     
     async def create_optimized_indexes(self, table_name: str = "search_data") -> None:
-        """Create optimized search indexes for better performance."""
+        """Create optimized search indexes for better performance.
+        
+        Adding the stored search_tsv column rewrites the table under an ACCESS EXCLUSIVE lock,
+        so run this in a maintenance window on large existing tables.
+        """
         if not self.pool:
             raise DatabaseConnectionError("Not connected to PostgreSQL")
         
         try:
             async with self.pool.acquire() as conn:
-                # Create GIN index for full-text search
+                # Store the full-text document so queries read it instead of rebuilding it per row
                 await conn.execute(f"""
-                    CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_{table_name}_fts 
-                    ON {table_name} USING GIN(to_tsvector('english', title || ' ' || COALESCE(description, '')))
+                    ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS search_tsv tsvector
+                    GENERATED ALWAYS AS ({FTS_DOCUMENT}) STORED
+                """)
+                
+                # GIN index for full-text search. Its own name, since idx_{table}_fts may already exist
+                # as an expression index that can't serve search_tsv queries
+                await conn.execute(f"""
+                    CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_{table_name}_search_tsv 
+                    ON {table_name} USING GIN(search_tsv)
                 """)
                 
                 # Create trigram indexes for fuzzy search
@@ -276,6 +405,7 @@ class PostgreSQLProvider:
                     ON {table_name} (category, visibility) WHERE visibility = 'public'
                 """)
                 
+                await self._detect_search_tsv(conn)
                 logger.info(f"Created optimized search indexes for {table_name}")
                 
         except Exception as e:
@@ -320,10 +450,39 @@ class PostgreSQLProvider:
     
     # Private helper methods
     
+    def _unix_socket_kwargs(self) -> Dict[str, Any]:
+        """
+        host/port overrides that route a local DSN through unix_socket_dir.
+        
+        Empty unless a socket directory is configured, the DSN points at this
+        machine and the server's socket file exists.
+        """
+        if not self.unix_socket_dir:
+            return {}
+        try:
+            dsn = urlsplit(self.connection_string)
+            port = dsn.port or 5432
+        except ValueError:
+            return {}
+        if dsn.hostname not in _LOCAL_HOSTS:
+            return {}
+        if not os.path.exists(os.path.join(self.unix_socket_dir, f".s.PGSQL.{port}")):
+            return {}
+        # An explicit host makes asyncpg ignore the DSN's host list, port included
+        return {"host": self.unix_socket_dir, "port": port}
+    
+    async def _init_connection(self, conn: asyncpg.Connection) -> None:
+        """Decode json/jsonb columns in the driver so rows arrive with parsed values."""
+        decoder = orjson.loads if _HAS_ORJSON else json.loads
+        for type_name in ('json', 'jsonb'):
+            await conn.set_type_codec(type_name, encoder=json.dumps, decoder=decoder, schema='pg_catalog')
+    
     async def _initialize_extensions(self) -> None:
         """Initialize required PostgreSQL extensions."""
+        pool = self.pool
+        assert pool is not None, "called from connect() once the pool exists"
         try:
-            async with self.pool.acquire() as conn:
+            async with pool.acquire() as conn:
                 # Enable trigram extension for fuzzy search
                 await conn.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
                 
@@ -334,13 +493,140 @@ class PostgreSQLProvider:
                 
         except Exception as e:
             logger.warning(f"Failed to initialize some extensions: {e}")
+        
+        async with pool.acquire() as conn:
+            await self._detect_search_tsv(conn)
+            await self._prewarm_indexes(conn)
+    
+    async def _prewarm_indexes(self, conn: asyncpg.Connection) -> None:
+        """Load the configured search indexes into shared buffers."""
+        index_names = self.search_config["prewarm_indexes"]
+        if not index_names:
+            return
+        
+        try:
+            await conn.execute("CREATE EXTENSION IF NOT EXISTS pg_prewarm")
+        except Exception as e:
+            logger.warning(f"pg_prewarm unavailable, skipping index prewarm: {e}")
+            return
+        
+        for index_name in index_names:
+            try:
+                blocks = await conn.fetchval("""
+                    SELECT pg_prewarm(index_oid) FROM (SELECT to_regclass($1) AS index_oid) i
+                    WHERE index_oid IS NOT NULL
+                """, index_name)
+                if blocks is None:
+                    logger.debug("Index %s does not exist, not prewarming it", index_name)
+                    continue
+                logger.info("Prewarmed %s (%d blocks)", index_name, blocks)
+            except Exception as e:
+                logger.warning(f"Failed to prewarm {index_name}: {e}")
+    
+    async def _detect_search_tsv(self, conn: asyncpg.Connection) -> None:
+        """Read full-text documents from search_data.search_tsv once a valid GIN index covers it."""
+        # Until then the query keeps the expression form, which a pre-upgrade expression index serves
+        has_index = await conn.fetchval("""
+            SELECT EXISTS (
+                SELECT 1
+                FROM pg_index i
+                JOIN pg_class t ON t.oid = i.indrelid
+                JOIN pg_namespace n ON n.oid = t.relnamespace
+                JOIN pg_class ic ON ic.oid = i.indexrelid
+                JOIN pg_am am ON am.oid = ic.relam
+                JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = ANY(i.indkey)
+                WHERE n.nspname = current_schema() AND t.relname = $1
+                  AND a.attname = 'search_tsv' AND am.amname = 'gin' AND i.indisvalid
+            )
+        """, SEARCH_TABLE)
+        if has_index != self._has_search_tsv:
+            self._has_search_tsv = has_index
+            self._query_templates.clear()
+            self._batch_templates.clear()
     
     def _build_search_query(self, query: str, options: SearchOptions) -> tuple[str, List[Any]]:
-        """Build dynamic search query based on configuration and options."""
-        base_table = "search_data"  # This would be configurable
+        """Build search query parameters and look up the SQL template for their shape."""
+        # The term is a bound parameter, so it needs no quoting; _convert_rows_to_results() strips it the same way
+        search_term = query.strip()
+        
+        # Parameters are bound in template order: term, ILIKE pattern or threshold, filters, dates, paging
+        params: List[Any] = [search_term]
+        if self.search_config["use_trigram_search"]:
+            params.append(self.search_config["similarity_threshold"])
+        elif self.search_config["enable_fuzzy_search"]:
+            params.append(f"%{search_term}%")
+        
+        # Each filter list binds as one text[] parameter, whatever its length
+        filters = options.filters
+        type_values = [t.value if hasattr(t, 'value') else str(t) for t in filters.type] if filters and filters.type else None
+        categories = list(filters.category) if filters and filters.category else None
+        date_range = filters.date_range if filters else None
+        start = date_range.start if date_range else None
+        end = date_range.end if date_range else None
+        for value in (type_values, categories, start, end):
+            if value:
+                params.append(value)
+        params.append(options.limit)
+        params.append(options.offset)
+        
+        # Only the sort and which filters are present change the SQL text
+        shape = (options.sort_by, options.sort_order, bool(type_values), bool(categories), bool(start), bool(end))
+        query_sql = self._query_templates.get(shape)
+        if query_sql is None:
+            query_sql = self._build_search_template(*shape)
+            if len(self._query_templates) < self.statement_cache_size:
+                self._query_templates[shape] = query_sql
         
-        # Sanitize and prepare query
-        search_term = query.strip().replace("'", "''")
+        return query_sql, params
+    
+    def _build_batch_query(self, queries: List[str], options: SearchOptions) -> tuple[str, List[Any]]:
+        """Build one statement running the search for every query, with the shared parameters bound once."""
+        search_query, params = self._build_search_query(queries[0], options)
+        # The term, plus the ILIKE pattern in fuzzy mode, are the only per-query parameters
+        term_params = 2 if not self.search_config["use_trigram_search"] and self.search_config["enable_fuzzy_search"] else 1
+        
+        batch_sql = self._batch_templates.get(search_query)
+        if batch_sql is None:
+            batch_sql = self._build_batch_template(search_query, term_params)
+            if len(self._batch_templates) < self.statement_cache_size:
+                self._batch_templates[search_query] = batch_sql
+        
+        return batch_sql, [[query.strip() for query in queries], *params[term_params:]]
+    
+    def _build_batch_template(self, search_query: str, term_params: int) -> str:
+        """Wrap a single-search template in a LATERAL join over the unnested terms."""
+        def placeholder(match: "re.Match[str]") -> str:
+            number = int(match.group(1))
+            if number == 1:
+                return "q.term"
+            if number <= term_params:
+                return "('%' || q.term || '%')"
+            # Shared parameters follow the text[] of terms bound as $1
+            return f"${number - term_params + 1}"
+        
+        lateral = _PLACEHOLDER.sub(placeholder, search_query)
+        # row_number() over the already ordered page keeps each query's ranking in the final ORDER BY
+        return f"""
+            SELECT page.*, q.ord AS batch_ord
+            FROM unnest($1::text[]) WITH ORDINALITY AS q(term, ord)
+            CROSS JOIN LATERAL (
+                SELECT ordered.*, row_number() OVER () AS batch_pos
+                FROM ({lateral}) AS ordered
+            ) AS page
+            ORDER BY q.ord, page.batch_pos
+        """
+    
+    def _build_search_template(
+        self,
+        sort_by: SortBy,
+        sort_order: SortOrder,
+        has_types: bool,
+        has_categories: bool,
+        has_start: bool,
+        has_end: bool
+    ) -> str:
+        """Build the SQL text for one query shape, with $N placeholders for every value."""
+        base_table = SEARCH_TABLE
         
         # Start building the query components
         select_parts = [
@@ -357,203 +643,202 @@ class PostgreSQLProvider:
         ]
         
         # Add relevance scoring
+        fts_document = "search_tsv" if self._has_search_tsv else FTS_DOCUMENT
         if self.search_config["use_full_text_search"]:
             select_parts.append(
-                "ts_rank(to_tsvector('english', title || ' ' || COALESCE(description, '')), plainto_tsquery('english', $1)) as fts_rank"
+                f"ts_rank({fts_document}, plainto_tsquery('english', $1)) as fts_rank"
             )
         
         if self.search_config["use_trigram_search"]:
             select_parts.append(
-                f"GREATEST(similarity(title, $1), similarity(COALESCE(description, ''), $1)) as similarity_rank"
+                "GREATEST(similarity(title, $1), similarity(COALESCE(description, ''), $1)) as similarity_rank"
             )
         
         # Build WHERE clauses
         where_conditions = ["visibility = 'public'"]  # Default visibility filter
-        params = [search_term]
+        placeholder_count = 1
         
         # Add search conditions
         search_conditions = []
         
         if self.search_config["use_full_text_search"]:
             search_conditions.append(
-                "to_tsvector('english', title || ' ' || COALESCE(description, '')) @@ plainto_tsquery('english', $1)"
+                f"{fts_document} @@ plainto_tsquery('english', $1)"
             )
         
         if self.search_config["use_trigram_search"]:
-            threshold = self.search_config["similarity_threshold"]
             search_conditions.append(
-                f"(similarity(title, $1) > {threshold} OR similarity(COALESCE(description, ''), $1) > {threshold})"
+                "(similarity(title, $1) > $2 OR similarity(COALESCE(description, ''), $1) > $2)"
             )
-        
-        # Add fuzzy search with ILIKE
-        if self.search_config["enable_fuzzy_search"]:
+            placeholder_count += 1
+        elif self.search_config["enable_fuzzy_search"]:
+            # Trigram similarity already covers fuzzy matching; an ILIKE OR'd next to it
+            # can't use an index and turns the whole search into a sequential scan
             search_conditions.append("(title ILIKE $2 OR description ILIKE $2)")
-            params.append(f"%{search_term}%")
+            placeholder_count += 1
         
         # Combine search conditions with OR
         if search_conditions:
             where_conditions.append(f"({' OR '.join(search_conditions)})")
         
         # Add filters from options
-        if options.filters and options.filters.type:
-            type_placeholders = ",".join(f"${len(params) + i + 1}" for i in range(len(options.filters.type)))
-            where_conditions.append(f"type IN ({type_placeholders})")
-            params.extend([t.value if hasattr(t, 'value') else str(t) for t in options.filters.type])
-        
-        if options.filters and options.filters.category:
-            category_placeholders = ",".join(f"${len(params) + i + 1}" for i in range(len(options.filters.category)))
-            where_conditions.append(f"category IN ({category_placeholders})")
-            params.extend(options.filters.category)
-        
-        # Build ORDER BY clause
-        order_parts = []
+        if has_types:
+            placeholder_count += 1
+            where_conditions.append(f"type = ANY(${placeholder_count}::text[])")
+        
+        if has_categories:
+            placeholder_count += 1
+            where_conditions.append(f"category = ANY(${placeholder_count}::text[])")
+        
+        # Date bounds filter before LIMIT so a page is never short of matching rows
+        if has_start:
+            placeholder_count += 1
+            where_conditions.append(f"created_at >= ${placeholder_count}")
+        if has_end:
+            placeholder_count += 1
+            where_conditions.append(f"created_at <= ${placeholder_count}")
+        
+        # Rank order of the matches, used as the tie-breaker for every sort
+        rank_order = []
         if self.search_config["use_full_text_search"]:
-            order_parts.append("fts_rank DESC")
+            rank_order.append("fts_rank DESC")
         if self.search_config["use_trigram_search"]:
-            order_parts.append("similarity_rank DESC")
-        
-        # Add user-specified sorting
-        if options.sort_by == SortBy.DATE:
-            order_parts.append(f"created_at {options.sort_order.value.upper()}")
-        elif options.sort_by == SortBy.NAME:
-            order_parts.append(f"title {options.sort_order.value.upper()}")
-        
-        # Default fallback sorting
-        if not order_parts:
-            order_parts.append("created_at DESC")
-        
-        # Construct final query
-        query_sql = f"""
-            SELECT {', '.join(select_parts)}
-            FROM {base_table}
-            WHERE {' AND '.join(where_conditions)}
+            rank_order.append("similarity_rank DESC")
+        if not rank_order:
+            rank_order.append("created_at DESC")
+        
+        # User-specified sorting comes first
+        direction = sort_order.value.upper()
+        order_parts = []
+        if sort_by == SortBy.RELEVANCE:
+            # Same score _convert_rows_to_results() assigns to each row
+            score_parts = ["50"]
+            if self.search_config["use_full_text_search"]:
+                score_parts.append("FLOOR(COALESCE(fts_rank, 0)::float8 * 40)")
+            if self.search_config["use_trigram_search"]:
+                score_parts.append("FLOOR(COALESCE(similarity_rank, 0)::float8 * 30)")
+            score_parts.append("CASE WHEN title <> '' AND strpos(lower(title), lower($1)) > 0 THEN 20 ELSE 0 END")
+            order_parts.append(f"LEAST(100, {' + '.join(score_parts)}) {direction}")
+        elif sort_by == SortBy.DATE:
+            order_parts.append(f"created_at {direction} NULLS LAST")
+        elif sort_by == SortBy.NAME:
+            order_parts.append(f'lower(title) COLLATE "C" {direction}')
+        order_parts.extend(rank_order)
+        # A unique last key keeps LIMIT/OFFSET pages consistent across calls
+        order_parts.append("id")
+        
+        # Construct final query; ranking in a subquery lets ORDER BY use the rank columns in expressions
+        return f"""
+            SELECT * FROM (
+                SELECT {', '.join(select_parts)}
+                FROM {base_table}
+                WHERE {' AND '.join(where_conditions)}
+            ) AS ranked
             ORDER BY {', '.join(order_parts)}
-            LIMIT ${len(params) + 1} OFFSET ${len(params) + 2}
+            LIMIT ${placeholder_count + 1} OFFSET ${placeholder_count + 2}
         """
-        
-        params.extend([options.limit, options.offset])
-        
-        return query_sql, params
+    
+    async def _fetch_streamed(
+        self,
+        conn: asyncpg.Connection,
+        search_query: str,
+        params: List[Any],
+        query: str
+    ) -> List[SearchResult]:
+        """Convert rows batch by batch from a server-side cursor instead of buffering them all."""
+        results = []
+        # Cursors only exist inside a transaction
+        async with conn.transaction(readonly=True):
+            cursor = await conn.cursor(search_query, *params)
+            while True:
+                rows = await cursor.fetch(STREAM_BATCH_SIZE)
+                results.extend(self._convert_rows_to_results(rows, query))
+                if len(rows) < STREAM_BATCH_SIZE:
+                    break
+        return results
     
     def _convert_rows_to_results(self, rows: List[asyncpg.Record], query: str) -> List[SearchResult]:
-        """Convert database rows to SearchResult objects."""
+        """Convert database rows to SearchResult objects in a single pass."""
         results = []
+        # Matches the term bound as $1, so the title boost agrees with the SQL relevance ORDER BY
+        query_lower = query.strip().lower()
+        
+        # Rank columns follow the fixed columns in the order _build_search_template() selects them
+        fts_index = 10 if self.search_config["use_full_text_search"] else None
+        similarity_index = (10 if fts_index is None else 11) if self.search_config["use_trigram_search"] else None
         
         for row in rows:
             try:
-                # Determine match type based on where the query was found
-                match_type = self._determine_match_type(row, query)
+                (row_id, row_type, title, description, author, category,
+                 language, visibility, created_at, metadata) = row[:10]
+                title_match = bool(title) and query_lower in title.lower()
                 
-                # Calculate relevance score
-                relevance_score = self._calculate_relevance_score(row, query)
+                # Determine match type based on where the query was found
+                if title_match:
+                    match_type = MatchType.TITLE
+                elif author and query_lower in author.lower():
+                    match_type = MatchType.AUTHOR
+                elif description and query_lower in description.lower():
+                    match_type = MatchType.DESCRIPTION
+                elif category and query_lower in category.lower():
+                    match_type = MatchType.CATEGORY
+                else:
+                    match_type = MatchType.CUSTOM
                 
-                # Parse metadata if it exists
-                metadata = {}
-                if hasattr(row, 'metadata') and row.metadata:
-                    if isinstance(row.metadata, str):
-                        metadata = json.loads(row.metadata)
-                    elif isinstance(row.metadata, dict):
-                        metadata = row.metadata
+                # Base score plus the full-text and trigram ranks, boosted for exact title matches
+                score = 50
+                if fts_index is not None and row[fts_index]:
+                    score += int(row[fts_index] * 40)
+                if similarity_index is not None and row[similarity_index]:
+                    score += int(row[similarity_index] * 30)
+                if title_match:
+                    score += 20
                 
                 # Create SearchResult
                 result = SearchResult(
-                    id=str(row.id),
-                    type=SearchResultType(row.type) if row.type else SearchResultType.CUSTOM,
-                    title=row.title or "",
-                    relevance_score=relevance_score,
+                    id=str(row_id),
+                    type=SearchResultType(row_type) if row_type else SearchResultType.CUSTOM,
+                    title=title or "",
+                    relevance_score=max(0, min(100, score)),
                     match_type=match_type,
-                    description=row.description,
-                    author=row.author,
-                    category=row.category,
-                    language=row.language or "en",
-                    visibility=row.visibility or "public",
-                    created_at=row.created_at,
-                    metadata=metadata
+                    description=description,
+                    author=author,
+                    category=category,
+                    language=language or "en",
+                    visibility=visibility or "public",
+                    created_at=created_at,
+                    # jsonb metadata is already decoded by the connection's type codec
+                    metadata=metadata if isinstance(metadata, dict) else {},
+                    # Enums and the clamped score above are already validated
+                    _trusted=True
                 )
                 
                 results.append(result)
                 
             except Exception as e:
-                logger.warning(f"Failed to convert row to SearchResult: {e}")
+                logger.warning("Failed to convert row to SearchResult: %s", e)
                 continue
         
         return results
     
-    def _determine_match_type(self, row: asyncpg.Record, query: str) -> MatchType:
-        """Determine where the search query matched."""
-        query_lower = query.lower()
-        
-        if hasattr(row, 'title') and row.title and query_lower in row.title.lower():
-            return MatchType.TITLE
-        elif hasattr(row, 'author') and row.author and query_lower in row.author.lower():
-            return MatchType.AUTHOR  
-        elif hasattr(row, 'description') and row.description and query_lower in row.description.lower():
-            return MatchType.DESCRIPTION
-        elif hasattr(row, 'category') and row.category and query_lower in row.category.lower():
-            return MatchType.CATEGORY
-        else:
-            return MatchType.CUSTOM
-    
-    def _calculate_relevance_score(self, row: asyncpg.Record, query: str) -> int:
-        """Calculate relevance score based on available ranking data."""
-        score = 50  # Base score
-        
-        # Use full-text search rank if available
-        if hasattr(row, 'fts_rank') and row.fts_rank:
-            score += int(row.fts_rank * 40)
-        
-        # Use trigram similarity rank if available
-        if hasattr(row, 'similarity_rank') and row.similarity_rank:
-            score += int(row.similarity_rank * 30)
-        
-        # Boost for exact matches in title
-        if hasattr(row, 'title') and row.title and query.lower() in row.title.lower():
-            score += 20
-        
-        # Ensure score is within valid range
-        return max(0, min(100, score))
-    
-    def _apply_post_processing(self, results: List[SearchResult], options: SearchOptions) -> List[SearchResult]:
-        """Apply final filtering and sorting to results."""
-        filtered_results = results
-        
-        # Apply additional date range filtering if specified
-        if options.filters and options.filters.date_range:
-            date_range = options.filters.date_range
-            if date_range.start or date_range.end:
-                filtered_results = [
-                    r for r in filtered_results
-                    if self._is_within_date_range(r.created_at, date_range.start, date_range.end)
-                ]
-        
-        # Ensure results are sorted according to user preference
-        if options.sort_by == SortBy.RELEVANCE:
-            filtered_results.sort(key=lambda x: x.relevance_score, reverse=(options.sort_order == SortOrder.DESC))
-        elif options.sort_by == SortBy.DATE and all(r.created_at for r in filtered_results):
-            filtered_results.sort(key=lambda x: x.created_at or x.created_at, reverse=(options.sort_order == SortOrder.DESC))
-        elif options.sort_by == SortBy.NAME:
-            filtered_results.sort(key=lambda x: x.title.lower(), reverse=(options.sort_order == SortOrder.DESC))
-        
-        return filtered_results
-    
-    def _is_within_date_range(self, date, start_date, end_date) -> bool:
-        """Check if date is within the specified range."""
-        if not date:
-            return True
-            
-        if start_date and date < start_date:
-            return False
-        if end_date and date > end_date:
-            return False
-        return True
+    @property
+    def query_stats(self) -> Dict[str, Any]:
+        """Snapshot of the performance counters, with total_time in milliseconds."""
+        return {
+            "total_queries": self._total_queries,
+            "total_time": self._total_time_ns / 1e6,
+            "slow_queries": self._slow_queries,
+            "error_count": self._error_count
+        }
     
-    def _update_query_stats(self, query_time: float, result_count: int) -> None:
+    def _update_query_stats(self, query_ns: int, result_count: int, query: str) -> None:
         """Update internal performance statistics."""
-        self.query_stats["total_queries"] += 1
-        self.query_stats["total_time"] += query_time
+        self._total_queries += 1
+        self._total_time_ns += query_ns
         
-        if query_time > 1000:  # Queries slower than 1 second
-            self.query_stats["slow_queries"] += 1
+        if query_ns > SLOW_QUERY_NS:
+            self._slow_queries += 1
+            self.slow_log.append((query, query_ns / 1e6, result_count))
     
     def _generate_optimization_suggestions(self, plan: Dict[str, Any], query: str, options: SearchOptions) -> List[str]:
         """Generate performance optimization suggestions based on query plan."""
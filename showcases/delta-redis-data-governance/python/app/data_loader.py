@@ -1,7 +1,19 @@
 import os
 import json
+import hashlib
 from typing import Any, Dict, Generator, Iterable
 
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+# Both parsers accept bytes, so files are read in binary mode and never decoded separately
+_json_loads = orjson.loads if _HAS_ORJSON else json.loads
+
+_READ_BUFFER_SIZE = 1 << 20
+
 
 def iter_incoming_rows(incoming_dir: str, dataset: str) -> Generator[Dict[str, Any], None, None]:
     if not incoming_dir or not os.path.isdir(incoming_dir):
@@ -14,18 +26,18 @@ def iter_incoming_rows(incoming_dir: str, dataset: str) -> Generator[Dict[str, A
             continue
         try:
             if fname.endswith('.jsonl'):
-                with open(path, 'r') as f:
+                with open(path, 'rb', buffering=_READ_BUFFER_SIZE) as f:
                     for line in f:
                         try:
-                            obj = json.loads(line)
+                            obj = _json_loads(line)
                         except Exception:
                             continue
                         row = transform_object_to_row(obj, dataset)
                         if row:
                             yield row
             elif fname.endswith('.json'):
-                with open(path, 'r') as f:
-                    data = json.load(f)
+                with open(path, 'rb') as f:
+                    data = _json_loads(f.read())
                     if isinstance(data, list):
                         for obj in data:
                             row = transform_object_to_row(obj, dataset)
@@ -35,6 +47,11 @@ def iter_incoming_rows(incoming_dir: str, dataset: str) -> Generator[Dict[str, A
             continue
 
 
+def _stable_id_hash(value: str) -> int:
+    # Unlike hash(), unaffected by PYTHONHASHSEED, so reloading the same data yields the same IDs
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), 'little')
+
+
 def transform_object_to_row(obj: Dict[str, Any], dataset: str) -> Dict[str, Any] | None:
     # Try to map common fields from various sources
     name = obj.get('name') or obj.get('title') or obj.get('company_name') or obj.get('study_title')
@@ -47,7 +64,7 @@ def transform_object_to_row(obj: Dict[str, Any], dataset: str) -> Dict[str, Any]
         condition = (condition[0] if condition else 'general')
     region = obj.get('region') or obj.get('country') or 'NE'
     address = obj.get('address') or obj.get('location') or 'Unknown'
-    idx = abs(hash(name)) % 1000000
+    idx = _stable_id_hash(str(name)) % 1000000
     return {
         'id': f'{dataset[:3]}-{idx}',
         'name': str(name)[:120],
@@ -1,52 +1,310 @@
-from typing import Any, Dict, Tuple, Callable
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Callable, Union
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
 
-def compile_policy(policy: Dict[str, Any], role: str, user_ctx: Dict[str, Any]) -> Tuple[Callable[[Dict[str, Any]], bool], Dict[str, str]]:
+from .utils.masking import (
+    redact_full, redact_part, hash_value, tokenize, initials,
+    year_only, yyyy_mm, city_only
+)
+
+
+def _mask_null(value: Any) -> None:
+    return None
+
+
+def _mask_last_four(value: Any) -> Any:
+    return redact_part(value, keep=4)
+
+
+# Mask name -> masking function; unknown names leave the field untouched
+MASK_FNS: Dict[str, Callable[[Any], Any]] = {
+    'redact_full': redact_full,
+    'redact_part': _mask_last_four,
+    'hash': hash_value,
+    'tokenize': tokenize,
+    'initials': initials,
+    'year_only': year_only,
+    'yyyy_mm': yyyy_mm,
+    'city_only': city_only,
+    'null': _mask_null,
+    'none': _mask_null,
+}
+
+MaskPlan = List[Tuple[str, Callable[[Any], Any]]]
+
+
+def allow_all(row: Dict[str, Any]) -> bool:
+    return True
+
+
+# Row filter AST, e.g. "clinician_id == ${user.id}" -> Compare('==', Attr('clinician_id'), Var(('id',)))
+class Attr(NamedTuple):
+    name: str
+
+
+class Var(NamedTuple):
+    path: Tuple[str, ...]
+
+
+class Const(NamedTuple):
+    value: Any
+
+
+class Compare(NamedTuple):
+    op: str
+    left: Any
+    right: Any
+
+
+class BoolOp(NamedTuple):
+    op: str
+    left: Any
+    right: Any
+
+
+_TOKEN_RE = re.compile(r"""\s*(\$\{[^}]*\}|'[^']*'|"[^"]*"|==|!=|[()]|-?\d+(?:\.\d+)?|[A-Za-z_][A-Za-z0-9_.]*)""")
+_KEYWORDS = {'true': True, 'false': False, 'null': None}
+
+
+def _tokenize(source: str) -> List[str]:
+    tokens, pos = [], 0
+    source = source.rstrip()
+    while pos < len(source):
+        m = _TOKEN_RE.match(source, pos)
+        if not m:
+            raise ValueError(f"unexpected character at {pos} in row_filter {source!r}")
+        tokens.append(m.group(1))
+        pos = m.end()
+    return tokens
+
+
+@lru_cache(maxsize=256)
+def parse_row_filter(source: str) -> Any:
+    # expr := and_expr ('or' and_expr)*; and_expr := cmp ('and' cmp)*;
+    # cmp := operand (('==' | '!=' | 'in') operand)?; operand := '(' expr ')' | ${user.x} | literal | column
+    tokens = _tokenize(source)
+    pos = 0
+
+    def peek() -> Any:
+        return tokens[pos] if pos < len(tokens) else None
+
+    def take() -> str:
+        nonlocal pos
+        if pos >= len(tokens):
+            raise ValueError(f"unexpected end of row_filter {source!r}")
+        pos += 1
+        return tokens[pos - 1]
+
+    def expr() -> Any:
+        node = and_expr()
+        while peek() and peek().lower() == 'or':
+            take()
+            node = BoolOp('or', node, and_expr())
+        return node
+
+    def and_expr() -> Any:
+        node = comparison()
+        while peek() and peek().lower() == 'and':
+            take()
+            node = BoolOp('and', node, comparison())
+        return node
+
+    def comparison() -> Any:
+        node = operand()
+        if peek() in ('==', '!=', 'in'):
+            op = take()
+            node = Compare(op, node, operand())
+        return node
+
+    def operand() -> Any:
+        tok = take()
+        if tok == '(':
+            node = expr()
+            if take() != ')':
+                raise ValueError(f"expected ')' in row_filter {source!r}")
+            return node
+        if tok.startswith('${'):
+            root, _, path = tok[2:-1].strip().partition('.')
+            if root != 'user' or not path:
+                raise ValueError(f"unknown variable {tok} in row_filter {source!r}")
+            return Var(tuple(path.split('.')))
+        if tok[0] in '\'"':
+            return Const(tok[1:-1])
+        if tok[0].isdigit() or tok[0] == '-':
+            return Const(float(tok) if '.' in tok else int(tok))
+        if tok.lower() in _KEYWORDS:
+            return Const(_KEYWORDS[tok.lower()])
+        if tok[0].isalpha() or tok[0] == '_':
+            return Attr(tok)
+        raise ValueError(f"unexpected {tok!r} in row_filter {source!r}")
+
+    node = expr()
+    if pos != len(tokens):
+        raise ValueError(f"unexpected {tokens[pos]!r} in row_filter {source!r}")
+    return node
+
+
+def _resolve_var(var: Var, user_ctx: Dict[str, Any]) -> Any:
+    value: Any = user_ctx
+    for key in var.path:
+        value = value.get(key) if isinstance(value, dict) else None
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        value = frozenset(value)
+    return value
+
+
+def _bind_value(node: Any, user_ctx: Dict[str, Any]) -> Tuple[bool, Any]:
+    # (True, value) for operands known before any row is seen, (False, row -> value) otherwise
+    if isinstance(node, Attr):
+        return False, lambda row, name=node.name: row.get(name)
+    if isinstance(node, Var):
+        return True, _resolve_var(node, user_ctx)
+    if isinstance(node, Const):
+        return True, node.value
+    return False, bind_row_filter(node, user_ctx)
+
+
+def bind_row_filter(node: Any, user_ctx: Dict[str, Any]) -> Callable[[Dict[str, Any]], Any]:
+    # Turns a parsed row filter into a row predicate with the user's values captured up front
+    if isinstance(node, BoolOp):
+        left, right = bind_row_filter(node.left, user_ctx), bind_row_filter(node.right, user_ctx)
+        if node.op == 'and':
+            return lambda row: left(row) and right(row)
+        return lambda row: left(row) or right(row)
+
+    if isinstance(node, Compare):
+        if isinstance(node.left, Attr):
+            # The common "column op ${user.x}" form reads the column directly
+            name = node.left.name
+            is_const, right = _bind_value(node.right, user_ctx)
+            if is_const and right is None and node.op == 'in':
+                # A user attribute that isn't set allows nothing
+                right = frozenset()
+            if is_const:
+                if node.op == '==':
+                    return lambda row, name=name, value=right: row.get(name) == value
+                if node.op == '!=':
+                    return lambda row, name=name, value=right: row.get(name) != value
+                return lambda row, name=name, allowed=right: row.get(name) in allowed
+        left_const, left = _bind_value(node.left, user_ctx)
+        right_const, right = _bind_value(node.right, user_ctx)
+        get_left = (lambda row, value=left: value) if left_const else left
+        get_right = (lambda row, value=right: value) if right_const else right
+        if node.op == '==':
+            return lambda row: get_left(row) == get_right(row)
+        if node.op == '!=':
+            return lambda row: get_left(row) != get_right(row)
+        return lambda row: get_left(row) in get_right(row)
+
+    is_const, value = _bind_value(node, user_ctx)
+    if is_const:
+        return allow_all if value is True else (lambda row, value=value: bool(value))
+    return lambda row, get=value: bool(get(row))
+
+
+# Row filter over a table's columns: called with a lookup from field name to that field's string
+# column (None if the field isn't stored as one), returns a boolean mask or None to fall back to rows
+ArrowFilter = Callable[[Callable[[str], Any]], Any]
+
+
+def bind_arrow_filter(node: Any, user_ctx: Dict[str, Any]) -> Optional[ArrowFilter]:
+    # Column form of bind_row_filter() for "column op ${user.x}" comparisons joined by and/or;
+    # None when part of the filter only makes sense per row
+    if isinstance(node, BoolOp):
+        left, right = bind_arrow_filter(node.left, user_ctx), bind_arrow_filter(node.right, user_ctx)
+        if left is None or right is None:
+            return None
+        combine = pc.and_ if node.op == 'and' else pc.or_
+
+        def combined(column: Callable[[str], Any]) -> Any:
+            left_mask = left(column)
+            right_mask = right(column) if left_mask is not None else None
+            return None if right_mask is None else combine(left_mask, right_mask)
+        return combined
+
+    if not isinstance(node, Compare) or not isinstance(node.left, Attr):
+        return None
+    is_const, value = _bind_value(node.right, user_ctx)
+    if not is_const:
+        return None
+    name = node.left.name
+
+    if node.op == 'in':
+        if value is None:
+            value = frozenset()
+        # Only string sets compare the same way in Arrow as in Python
+        if not isinstance(value, frozenset) or not all(isinstance(item, str) for item in value):
+            return None
+        value_set = pa.array(sorted(value), pa.string())
+
+        def contained(column: Callable[[str], Any]) -> Any:
+            col = column(name)
+            return None if col is None else pc.is_in(col, value_set=value_set)
+        return contained
+
+    if not isinstance(value, str):
+        return None
+    # A missing field is None in Python, which never equals a string
+    compare, missing = (pc.equal, False) if node.op == '==' else (pc.not_equal, True)
+
+    def compared(column: Callable[[str], Any]) -> Any:
+        col = column(name)
+        return None if col is None else pc.fill_null(compare(col, value), missing)
+    return compared
+
+
+def compile_masks(masks: Dict[str, str]) -> MaskPlan:
+    return [(field, MASK_FNS[mask]) for field, mask in masks.items() if mask in MASK_FNS]
+
+
+def _role_config(policy: Dict[str, Any], role: str) -> Dict[str, Any]:
     roles = {r['id']: r for r in policy.get('roles', [])}
-    rconf = roles.get(role) or {"row_filter": "true", "column_masks": {}}
+    return roles.get(role) or {"row_filter": "true", "column_masks": {}}
+
+
+def compile_arrow_filter(policy: Dict[str, Any], role: str, user_ctx: Dict[str, Any]) -> Optional[ArrowFilter]:
+    # Vectorized twin of compile_policy()'s predicate, when pyarrow is installed and the filter allows it
+    row_filter = _role_config(policy, role).get('row_filter', 'true')
+    if not _HAS_PYARROW or row_filter in (True, 'true', 'TRUE', '1'):
+        return None
+    try:
+        return bind_arrow_filter(parse_row_filter(str(row_filter)), user_ctx)
+    except ValueError:
+        return None
+
+
+def compile_policy(policy: Dict[str, Any], role: str, user_ctx: Dict[str, Any]) -> Tuple[Callable[[Dict[str, Any]], bool], MaskPlan]:
+    rconf = _role_config(policy, role)
     row_filter = rconf.get('row_filter', 'true')
     masks = rconf.get('column_masks', {})
 
-    def predicate(row: Dict[str, Any]) -> bool:
-        # Very small expression support for demo
-        if row_filter in (True, 'true', 'TRUE', '1'):
-            return True
-        if 'region in ${user.allowed_regions}' in row_filter:
-            allowed = user_ctx.get('allowed_regions', [])
-            return row.get('region') in allowed
-        if 'clinician_id == ${user.id}' in row_filter:
-            return row.get('clinician_id') == user_ctx.get('id')
-        # Default allow to avoid empty demo
-        return True
-
-    return predicate, masks
-
-
-def apply_masks(row: Dict[str, Any], masks: Dict[str, str]) -> Dict[str, Any]:
-    from .utils.masking import (
-        redact_full, redact_part, hash_value, tokenize, initials,
-        year_only, yyyy_mm, city_only
-    )
-    out = dict(row)
-    for field, mask in masks.items():
-        val = out.get(field)
-        if mask == 'redact_full':
-            out[field] = redact_full(val)
-        elif mask == 'redact_part':
-            out[field] = redact_part(val, keep=4)
-        elif mask == 'hash':
-            out[field] = hash_value(val)
-        elif mask == 'tokenize':
-            out[field] = tokenize(val)
-        elif mask == 'initials':
-            out[field] = initials(val)
-        elif mask in ('year_only',):
-            out[field] = year_only(val)
-        elif mask in ('yyyy_mm',):
-            out[field] = yyyy_mm(val)
-        elif mask in ('city_only',):
-            out[field] = city_only(val)
-        elif mask in ('null', 'none'):
-            out[field] = None
+    # Small expression language for demo, parsed once per filter string and bound to this user
+    if row_filter in (True, 'true', 'TRUE', '1'):
+        predicate = allow_all
+    else:
+        try:
+            predicate = bind_row_filter(parse_row_filter(str(row_filter)), user_ctx)
+        except ValueError:
+            # Default allow to avoid empty demo
+            predicate = allow_all
+
+    return predicate, compile_masks(masks)
+
+
+def apply_masks(row: Dict[str, Any], masks: Union[MaskPlan, Dict[str, str]], in_place: bool = False) -> Dict[str, Any]:
+    # Takes the plan from compile_policy(); a raw column_masks dict is compiled on the spot.
+    # in_place=True masks a row the caller owns instead of copying it first
+    if isinstance(masks, dict):
+        masks = compile_masks(masks)
+    out = row if in_place else dict(row)
+    for field, mask_fn in masks:
+        out[field] = mask_fn(out.get(field))
     return out
 
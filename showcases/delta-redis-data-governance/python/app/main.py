@@ -2,16 +2,48 @@ import os
 import json
 import time
 import hashlib
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import yaml
 import redis
-from fastapi import FastAPI, Header, Request
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
+from fastapi import FastAPI, Header, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import requests
 
-from .governance import compile_policy, apply_masks
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+# Parses the dataset bytes as read from disk; dumps returns bytes with orjson, str without.
+# cache_key() keeps stdlib json for its canonical sort_keys serialization
+_json_loads = orjson.loads if _HAS_ORJSON else json.loads
+_json_dumps = orjson.dumps if _HAS_ORJSON else json.dumps
+
+
+def _json_line(row: Dict[str, Any]) -> bytes:
+    if _HAS_ORJSON:
+        return orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(row) + "\n").encode()
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
+
+from .governance import compile_policy, compile_arrow_filter, apply_masks, allow_all
 from .data_loader import iter_incoming_rows
 from pathlib import Path
 
@@ -20,6 +52,11 @@ DELTA_DIR = os.getenv('DELTA_DIR', '/data/delta')
 GOVERNANCE_DIR = os.getenv('GOVERNANCE_DIR', '/workspace/governance')
 
 r = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+# Cached /search bodies are kept and served as raw bytes
+r_bytes = redis.Redis.from_url(REDIS_URL)
+
+# JSONL path -> (mtime_ns, columnar copy of the dataset), see _dataset_table()
+_DATASET_CACHE: Dict[str, Tuple[int, Any]] = {}
 
 app = FastAPI(title="delta-api")
 app.add_middleware(
@@ -39,6 +76,9 @@ class SeedRequest(BaseModel):
     forceDownload: bool | None = None
 
 
+PROGRESS_FLUSH_CHUNKS = 10
+
+
 def _row_count_for_size(size: str) -> int:
     mapping = {
         'tiny': 1000,
@@ -49,8 +89,10 @@ def _row_count_for_size(size: str) -> int:
     return mapping.get(size, 1000)
 
 
+_CONDITIONS = ["asthma", "diabetes", "hypertension", "flu", "allergy"]
+
+
 def _generate_row(dataset: str, i: int) -> Dict[str, Any]:
-    conditions = ["asthma", "diabetes", "hypertension", "flu", "allergy"]
     return {
         "id": f"{dataset[:3]}-{i}",
         "name": f"Patient {i}",
@@ -58,11 +100,30 @@ def _generate_row(dataset: str, i: int) -> Dict[str, Any]:
         "dob": "1986-03-15",
         "address": "123 Main St, Gotham",
         "region": "NE" if i % 2 else "SW",
-        "condition": conditions[i % len(conditions)],
+        "condition": _CONDITIONS[i % len(_CONDITIONS)],
         "clinician_id": f"clin-{i % 50}"
     }
 
 
+# The JSON _generate_row() produces, as a bytes template; keep the two in sync
+_SYNTHETIC_LINE = (
+    b'{"id":"%s%d","name":"Patient %d","ssn":"123-45-%04d","dob":"1986-03-15",'
+    b'"address":"123 Main St, Gotham","region":"%s","condition":"%s","clinician_id":"clin-%d"}\n'
+)
+_CONDITION_BYTES = [c.encode() for c in _CONDITIONS]
+
+
+def _synthetic_lines(dataset: str, start: int, end: int) -> bytes:
+    # JSONL for _generate_row(dataset, i) over start..end, formatted directly without dicts or a JSON encoder
+    prefix = json.dumps(f"{dataset[:3]}-")[1:-1].encode()
+    conditions = _CONDITION_BYTES
+    n_conditions = len(conditions)
+    return b''.join([
+        _SYNTHETIC_LINE % (prefix, i, i, i, b"NE" if i % 2 else b"SW", conditions[i % n_conditions], i % 50)
+        for i in range(start, end + 1)
+    ])
+
+
 @app.post('/seed')
 def seed(req: SeedRequest):
     job_id = f"job_{int(time.time()*1000)}"
@@ -72,8 +133,9 @@ def seed(req: SeedRequest):
     Path(DELTA_DIR).mkdir(parents=True, exist_ok=True)
     outfile = os.path.join(DELTA_DIR, f"{req.dataset}_{req.size}.jsonl")
 
-    written = 0
     chunk = 1000
+    # Progress updates are queued per chunk and sent to Redis every PROGRESS_FLUSH_CHUNKS chunks
+    progress = r.pipeline(transaction=False)
     incoming_base = os.getenv('INCOMING_BASE_DIR', '/tmp/smart-search-incoming')
     incoming_dir = os.path.join(incoming_base, req.dataset)
     os.makedirs(incoming_dir, exist_ok=True)
@@ -83,16 +145,24 @@ def seed(req: SeedRequest):
         _download_live_data(req.dataset, incoming_dir)
     used_external = False
 
-    with open(outfile, 'w') as f:
+    # Rows are serialized a chunk at a time and written through a 1 MiB buffer
+    with open(outfile, 'wb', buffering=1 << 20) as f:
         # If external files available, stream-transform those first
         total_written = 0
         if os.path.isdir(incoming_dir):
+            buf: List[bytes] = []
             for row in iter_incoming_rows(incoming_dir, req.dataset):
-                f.write(json.dumps(row) + "\n")
-                total_written += 1
-                if total_written % chunk == 0:
+                buf.append(_json_line(row))
+                if len(buf) == chunk:
+                    f.write(b''.join(buf))
+                    buf.clear()
+                    total_written += chunk
                     pct = max(1, int(total_written / total_rows * 100))
-                    r.hset(f"progress:{job_id}", mapping={"status": "running", "pct": pct, "writtenRows": total_written})
+                    progress.hset(f"progress:{job_id}", mapping={"status": "running", "pct": pct, "writtenRows": total_written})
+                    if len(progress) >= PROGRESS_FLUSH_CHUNKS:
+                        progress.execute()
+            f.write(b''.join(buf))
+            total_written += len(buf)
             used_external = total_written > 0
 
         # Top up synthetic rows if external is insufficient
@@ -100,31 +170,22 @@ def seed(req: SeedRequest):
         if remaining > 0:
             for start in range(1, remaining + 1, chunk):
                 end = min(start + chunk - 1, remaining)
-                for i in range(start, end + 1):
-                    row = _generate_row(req.dataset, i)
-                    f.write(json.dumps(row) + "\n")
+                f.write(_synthetic_lines(req.dataset, start, end))
                 total_written += (end - start + 1)
                 pct = max(1, int(total_written / total_rows * 100))
-                r.hset(
-                    f"progress:{job_id}",
-                    mapping={"status": "running" if total_written < total_rows else "completed", "pct": pct, "writtenRows": total_written}
-                )
-                time.sleep(0.02)
-        for start in range(1, total_rows + 1, chunk):
-            end = min(start + chunk - 1, total_rows)
-            for i in range(start, end + 1):
-                row = _generate_row(req.dataset, i)
-                f.write(json.dumps(row) + "\n")
-            written = end
-            pct = max(1, int(written / total_rows * 100))
-            r.hset(
-                f"progress:{job_id}",
-                mapping={"status": "running" if written < total_rows else "completed", "pct": pct, "writtenRows": written}
-            )
-            time.sleep(0.05)
-
-    # Persist dataset meta
-    r.hset(f"dataset_meta:{req.dataset}", mapping={"path": outfile, "rows": total_rows, "size": req.size})
+                progress.hset(f"progress:{job_id}", mapping={"status": "running", "pct": pct, "writtenRows": total_written})
+                if len(progress) >= PROGRESS_FLUSH_CHUNKS:
+                    progress.execute()
+        progress.execute()
+
+    if _HAS_PYARROW:
+        _DATASET_CACHE.pop(outfile, None)
+        _write_dataset_store(outfile)
+
+    # Final status and dataset meta go out in one round trip
+    progress.hset(f"progress:{job_id}", mapping={"status": "completed", "pct": 100, "writtenRows": total_written})
+    progress.hset(f"dataset_meta:{req.dataset}", mapping={"path": outfile, "rows": total_rows, "size": req.size})
+    progress.execute()
 
     return {"jobId": job_id, "source": "external" if used_external else "synthetic"}
 
@@ -156,13 +217,19 @@ def _download_live_data(dataset: str, target_dir: str) -> None:
             ]
 
     for idx, url in enumerate(urls):
+        out = os.path.join(target_dir, f'part_{idx}.json')
+        # Stream to a temporary name so a failed download never leaves a truncated .json behind
+        tmp = out + '.part'
         try:
-            resp = requests.get(url, timeout=20)
-            if resp.ok:
-                out = os.path.join(target_dir, f'part_{idx}.json')
-                with open(out, 'wb') as f:
-                    f.write(resp.content)
+            with requests.get(url, timeout=20, stream=True) as resp:
+                if resp.ok:
+                    with open(tmp, 'wb') as f:
+                        for block in resp.iter_content(chunk_size=1 << 20):
+                            f.write(block)
+                    os.replace(tmp, out)
         except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
             continue
 
 
@@ -176,34 +243,187 @@ def progress(jobId: str):
     return data
 
 
+def _write_dataset_store(path: str) -> Any:
+    # Columnar copy of a JSONL dataset: the two searched fields pre-lowered, each row's raw JSON
+    # so only the rows that end up on a page are ever parsed, and a "field:<key>" column for every
+    # key holding only strings, for row filters. Saved next to the JSONL as .parquet
+    names: List[str] = []
+    conditions: List[str] = []
+    lines: List[bytes] = []
+    rows: List[Dict[str, Any]] = []
+    with open(path, 'rb') as f:
+        for line in f:
+            try:
+                row = _json_loads(line)
+            except Exception:
+                continue
+            if not isinstance(row, dict):
+                continue
+            name = row.get('name', '')
+            condition = row.get('condition', '')
+            names.append(name.lower() if isinstance(name, str) else '')
+            conditions.append(condition.lower() if isinstance(condition, str) else '')
+            lines.append(line.rstrip(b'\r\n'))
+            rows.append(row)
+    columns = {
+        'name_lower': pa.array(names, pa.string()),
+        # Few distinct conditions, so matching runs once per dictionary value
+        'condition_lower': pa.array(conditions, pa.string()).dictionary_encode(),
+        'row': pa.array(lines, pa.binary()),
+    }
+    for key in dict.fromkeys(key for row in rows for key in row):
+        values = [row.get(key) for row in rows]
+        if all(value is None or value.__class__ is str for value in values):
+            columns[f'field:{key}'] = pa.array(values, pa.string())
+    table = pa.table(columns)
+    pq.write_table(table, path + '.parquet')
+    return table
+
+
+def _dataset_table(path: str) -> Any:
+    mtime = os.stat(path).st_mtime_ns
+    cached = _DATASET_CACHE.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    store = path + '.parquet'
+    if os.path.exists(store) and os.stat(store).st_mtime_ns >= mtime:
+        table = pq.read_table(store, memory_map=True, read_dictionary=['condition_lower'])
+    else:
+        # Seeded before the columnar copy existed, or rewritten since
+        table = _write_dataset_store(path)
+    _DATASET_CACHE[path] = (mtime, table)
+    return table
+
+
+def _contains(column: Any, needle: str) -> Any:
+    # Substring mask over a (chunked) string column; dictionary chunks match each distinct value once
+    chunks = []
+    for chunk in column.chunks:
+        if pa.types.is_dictionary(chunk.type):
+            chunks.append(pc.take(pc.match_substring(chunk.dictionary, needle), chunk.indices))
+        else:
+            chunks.append(pc.match_substring(chunk, needle))
+    return pa.chunked_array(chunks, pa.bool_())
+
+
+# Text matches parsed per batch when paging through the columnar store
+_PARSE_BATCH = 1024
+
+
+def _paginate(rows: Iterable[Dict[str, Any]], predicate, offset: int, page_size: int, match_and_mask,
+              limit: Optional[int]) -> Tuple[List[Dict[str, Any]], int, bool]:
+    # Rows passed in already matched the text filter. Returns (items, total, complete); with a
+    # limit, counting stops at that many allowed rows and complete says whether all rows were seen
+    items: List[Dict[str, Any]] = []
+    total = 0
+    for row in rows:
+        # Apply RLS
+        if predicate(row):
+            if total >= offset and len(items) < page_size:
+                items.append(match_and_mask(row))
+            total += 1
+            if total == limit:
+                return items, total, False
+    return items, total, True
+
+
+def _field_column(table: Any, name: str) -> Any:
+    key = f'field:{name}'
+    return table[key] if key in table.column_names else None
+
+
+def _search_table(table: Any, ql: str, predicate, arrow_filter, offset: int, page_size: int, match_and_mask,
+                  limit: Optional[int]) -> Tuple[List[Dict[str, Any]], int, bool]:
+    text_mask = pc.or_(_contains(table['name_lower'], ql), _contains(table['condition_lower'], ql))
+    rls_mask = None
+    if arrow_filter is not None:
+        rls_mask = arrow_filter(lambda name: _field_column(table, name))
+    rows = table['row']
+    if predicate is allow_all or rls_mask is not None:
+        # Every match counts, only the page is parsed
+        matches = pc.indices_nonzero(text_mask if rls_mask is None else pc.and_(text_mask, rls_mask))
+        page = rows.take(matches[offset:offset + page_size]).to_pylist()
+        return [match_and_mask(_json_loads(line)) for line in page], len(matches), True
+
+    matches = pc.indices_nonzero(text_mask)
+
+    def parsed_matches():
+        for start in range(0, len(matches), _PARSE_BATCH):
+            for line in rows.take(matches[start:start + _PARSE_BATCH]).to_pylist():
+                yield _json_loads(line)
+
+    return _paginate(parsed_matches(), predicate, offset, page_size, match_and_mask, limit)
+
+
+def _search_jsonl(path: str, ql: str, predicate, offset: int, page_size: int, match_and_mask,
+                  limit: Optional[int]) -> Tuple[List[Dict[str, Any]], int, bool]:
+    def text_matches():
+        with open(path, 'rb') as f:
+            for line in f:
+                try:
+                    row = _json_loads(line)
+                except Exception:
+                    continue
+                if ql in row.get('name', '').lower() or ql in row.get('condition', '').lower():
+                    yield row
+
+    return _paginate(text_matches(), predicate, offset, page_size, match_and_mask, limit)
+
+
+def _stats_key(dataset: str, ql: str, user_role: str, context_raw: str) -> str:
+    # Exact match counts depend on what RLS lets this user see, so the role and context are part of the key
+    s = json.dumps({"q": ql, "role": user_role, "context": context_raw}, sort_keys=True)
+    return f"dataset_stats:{dataset}:" + hashlib.sha256(s.encode()).hexdigest()
+
+
+@lru_cache(maxsize=32)
+def _load_policy(policy_path: str, mtime_ns: int) -> Dict[str, Any]:
+    # One parse per policy file version, shared by every role and user compiled from it
+    with open(policy_path, 'r') as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+
+@lru_cache(maxsize=256)
+def _compiled_policy(policy_path: str, mtime_ns: int, user_role: str, context_raw: str) -> Tuple[Any, Any, Any]:
+    # Keyed by the policy file version and the raw context header, so editing the policy or
+    # changing any part of the user context compiles afresh
+    try:
+        user_ctx = json.loads(context_raw)
+    except Exception:
+        user_ctx = {}
+    policy = _load_policy(policy_path, mtime_ns)
+    predicate, mask_plan = compile_policy(policy, user_role, user_ctx)
+    return predicate, mask_plan, compile_arrow_filter(policy, user_role, user_ctx)
+
+
 def cache_key(params: Dict[str, Any], policy_version: str = "v1") -> str:
     s = json.dumps(params, sort_keys=True)
     return "search:" + hashlib.sha256((s + policy_version).encode()).hexdigest()
 
 
+def _search_response(body: bytes, cache: str) -> Response:
+    # body is a serialized response without its "strategy"; the marker is spliced onto the closing brace
+    content = body[:-1] + b',"strategy":{"cache":"%s"}}' % cache.encode()
+    return Response(content=content, media_type='application/json', headers={'X-Cache': cache})
+
+
 @app.get('/search')
-def search(request: Request, q: str, page: int = 1, pageSize: int = 25, dataset: str = 'healthcare'):
+def search(request: Request, q: str, page: int = 1, pageSize: int = 25, dataset: str = 'healthcare',
+           exactTotal: bool = False):
     user_role = request.headers.get('X-User-Role', 'business_user')
     context_raw = request.headers.get('X-User-Context', '{}')
-    try:
-        user_ctx = json.loads(context_raw)
-    except Exception:
-        user_ctx = {}
 
-    params = {"q": q, "page": page, "pageSize": pageSize, "dataset": dataset, "role": user_role}
+    # Row filters depend on the user context, so it's part of the key along with the role
+    params = {"q": q, "page": page, "pageSize": pageSize, "dataset": dataset, "role": user_role,
+              "context": context_raw, "exactTotal": exactTotal}
     key = cache_key(params)
-    cached = r.get(key)
+    cached = r_bytes.get(key)
     if cached:
-        payload = json.loads(cached)
-        payload["strategy"] = {"cache": "hit"}
-        return payload
+        return _search_response(cached, "hit")
 
     # Load governance policy
     policy_path = os.path.join(GOVERNANCE_DIR, f'{dataset}.yaml')
-    with open(policy_path, 'r') as f:
-        policy = yaml.safe_load(f)
-
-    predicate, mask_plan = compile_policy(policy, user_role, user_ctx)
+    predicate, mask_plan, arrow_filter = _compiled_policy(policy_path, os.stat(policy_path).st_mtime_ns, user_role, context_raw)
 
     # Load dataset from generated JSONL
     meta = r.hgetall(f"dataset_meta:{dataset}")
@@ -212,32 +432,43 @@ def search(request: Request, q: str, page: int = 1, pageSize: int = 25, dataset:
     ql = q.lower()
     offset = (page - 1) * pageSize
 
-    def match_and_mask(row: Dict[str, Any]) -> Dict[str, Any]:
-        return apply_masks(row, mask_plan)
+    # Unless an exact total is asked for, scanning stops once the page is filled: with a total
+    # counted earlier, right at the page end, otherwise one match later so clients see there's more
+    stats_key = _stats_key(dataset, ql, user_role, context_raw)
+    known_total = None if exactTotal else r.get(stats_key)
+    limit = None if exactTotal else offset + pageSize + (0 if known_total is not None else 1)
+    complete = True
+
+    if mask_plan:
+        def match_and_mask(row: Dict[str, Any], mask_plan=mask_plan) -> Dict[str, Any]:
+            # Every row below is parsed or generated fresh for this request, so mask it without copying
+            return apply_masks(row, mask_plan, in_place=True)
+    else:
+        def match_and_mask(row: Dict[str, Any]) -> Dict[str, Any]:
+            # Nothing to mask for this role, rows pass through as parsed
+            return row
 
     if meta and os.path.exists(meta.get('path', '')):
         path = meta['path']
-        with open(path, 'r') as f:
-            for line in f:
-                try:
-                    row = json.loads(line)
-                except Exception:
-                    continue
-                if ql in row.get('name', '').lower() or ql in row.get('condition', '').lower():
-                    # Apply RLS
-                    if predicate(row):
-                        if total >= offset and len(items) < pageSize:
-                            items.append(match_and_mask(row))
-                        total += 1
+        if _HAS_PYARROW:
+            items, total, complete = _search_table(_dataset_table(path), ql, predicate, arrow_filter, offset, pageSize,
+                                                   match_and_mask, limit)
+        else:
+            items, total, complete = _search_jsonl(path, ql, predicate, offset, pageSize, match_and_mask, limit)
+        if complete and known_total is None:
+            r.setex(stats_key, 300, total)
+        elif known_total is not None:
+            total = max(int(known_total), total)
+            complete = True
         # Fallback if nothing matched but dataset exists
         if total == 0:
             fsize = int(meta.get('rows', '0'))
             # take first page unfiltered as demo fallback
-            with open(path, 'r') as f2:
+            with open(path, 'rb') as f2:
                 for idx, line in enumerate(f2):
                     if idx < pageSize:
                         try:
-                            row = json.loads(line)
+                            row = _json_loads(line)
                             if predicate(row):
                                 items.append(match_and_mask(row))
                         except Exception:
@@ -259,10 +490,13 @@ def search(request: Request, q: str, page: int = 1, pageSize: int = 25, dataset:
         "items": items,
         "page": page,
         "total": total,
-        "maskedFields": list(mask_plan.keys()),
-        "strategy": {"cache": "miss"}
+        "totalExact": complete,
+        "maskedFields": [field for field, _ in mask_plan],
     }
 
-    r.setex(key, 300, json.dumps(response))
-    return response
+    body = _json_dumps(response)
+    if isinstance(body, str):
+        body = body.encode()
+    r_bytes.setex(key, 300, body)
+    return _search_response(body, "miss")
 
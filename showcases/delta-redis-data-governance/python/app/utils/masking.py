@@ -1,4 +1,8 @@
 import hashlib
+from functools import lru_cache
+
+# Distinct values remembered by hash_value() and tokenize(); lru_cache is bounded and thread-safe
+_DIGEST_CACHE_SIZE = 65536
 
 
 def redact_full(value):
@@ -12,21 +16,32 @@ def redact_part(value, keep=4):
     return ('*' * max(0, len(s) - keep)) + s[-keep:]
 
 
-def hash_value(value):
-    if value is None:
-        return None
+# typed=True keeps 1, 1.0 and True apart, since their str() differs
+@lru_cache(maxsize=_DIGEST_CACHE_SIZE, typed=True)
+def _hashed(value):
     return hashlib.sha256(str(value).encode()).hexdigest()[:16]
 
 
-_TOKENS = {}
+@lru_cache(maxsize=_DIGEST_CACHE_SIZE, typed=True)
+def _token(value):
+    return 'tok_' + hashlib.sha1(str(value).encode()).hexdigest()[:10]
+
+
+def hash_value(value):
+    if value is None:
+        return None
+    try:
+        return _hashed(value)
+    except TypeError:
+        # Unhashable values (lists, dicts) are cached by their text, which is what gets hashed
+        return _hashed(str(value))
 
 
 def tokenize(value):
-    if value in _TOKENS:
-        return _TOKENS[value]
-    token = 'tok_' + hashlib.sha1(str(value).encode()).hexdigest()[:10]
-    _TOKENS[value] = token
-    return token
+    try:
+        return _token(value)
+    except TypeError:
+        return _token(str(value))
 
 
 def initials(value):